@@ -9,25 +9,38 @@ Run:
 
 import logging
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
 import pandas as pd
-from flask import Flask, abort, redirect, render_template, send_from_directory
+from flask import Flask, abort, redirect, render_template, request, send_from_directory
 
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, ".."))
 EXAMPLE_DATA_DIR = os.path.join(CURRENT_DIR, "data")
 ASSETS_DIR = os.path.join(PROJECT_ROOT, "assets")
 DEFAULT_TCX_FILE = "1.tcx"
+# Versioned asset URLs never change content, so browsers may keep them for a year.
+ASSET_MAX_AGE = 60 * 60 * 24 * 365
+ZONE_COLUMNS = [f"z{zone}_sec" for zone in range(1, 6)]
+# Keywords that decide a rationale's tone, matched case-insensitively in one scan each.
+NEGATIVE_TONE_RE = re.compile(r"NEGATIVE|HIGH RESISTANCE|HEAT STRESS|STRUGGLING", re.IGNORECASE)
+POSITIVE_TONE_RE = re.compile(r"ASSISTED|COOLING EFFECT|PERFECT|STRONG", re.IGNORECASE)
 EXAMPLE_ACTIVITY_ID = 1
 
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
 
 from pace_view.data_cleaning import DataCleaner
 from pace_view.config import get_weather_api_key
 from pace_view.data_parsing import DataParser
+from plot_card_common import context_cache_path, load_context_cache, save_context_cache, template_bytecode_cache
 
 LOGGER = logging.getLogger(__name__)
 
@@ -39,25 +52,31 @@ def format_metric(value: Any, suffix: str = "", precision: int = 1) -> str:
 
 
 def format_datetime(value: Any, date_format: str) -> str:
+    # Timestamps and ISO strings skip the pandas parser; anything else still goes through it.
+    if isinstance(value, datetime) and value is not pd.NaT:
+        return value.strftime(date_format)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).strftime(date_format)
+        except ValueError:
+            pass
     timestamp = pd.to_datetime(value, errors="coerce")
     if pd.isna(timestamp):
         return "N/A"
     return timestamp.strftime(date_format)
 
 
-def zone_percentages(activity_row: pd.Series) -> list[float]:
-    zone_seconds = []
-    for zone in range(1, 6):
-        raw_value = activity_row.get(f"z{zone}_sec", 0)
-        zone_seconds.append(0.0 if raw_value is None or pd.isna(raw_value) else float(raw_value))
-
+def zone_percentages(activity_row: dict[str, Any]) -> list[float]:
+    # Missing or NaN zone columns count as zero seconds.
+    zone_seconds = [activity_row.get(column) for column in ZONE_COLUMNS]
+    zone_seconds = [0.0 if pd.isna(seconds) else float(seconds) for seconds in zone_seconds]
     total_seconds = sum(zone_seconds)
     if total_seconds <= 0:
         return [0.0] * 5
-    return [seconds / total_seconds * 100.0 for seconds in zone_seconds]
+    return [seconds * 100.0 / total_seconds for seconds in zone_seconds]
 
 
-def build_simple_explanation(activity_row: pd.Series) -> str:
+def build_simple_explanation(activity_row: dict[str, Any]) -> str:
     distance = activity_row.get("distance_km")
     duration = activity_row.get("duration_min")
     speed = activity_row.get("speed_kmh")
@@ -96,8 +115,21 @@ def initialize_context_pipeline(history_folder: str):
             history_folder=history_folder,
             weather_api_key=get_weather_api_key(),
         )
-        trainer.fit()
-        pattern_report = trainer.mine_patterns()
+        # Reuse the fitted twin and mined rules while the TCX files are unchanged.
+        # Only the model is stored so the weather API key never lands on disk.
+        use_cache = os.getenv("PACE_DISABLE_CACHE") != "1"
+        cache_path = context_cache_path(history_folder, trainer.model.model)
+        cached = load_context_cache(cache_path) if use_cache else None
+        if cached is not None:
+            trainer.model = cached["model"]
+            trainer.counterfactual.model = cached["model"]
+            pattern_report = cached["pattern_report"]
+        else:
+            # Parsing the history is per-file work, so spread it over the available cores.
+            trainer.fit(workers=os.cpu_count() or 1)
+            pattern_report = trainer.mine_patterns()
+            if use_cache:
+                save_context_cache(cache_path, {"model": trainer.model, "pattern_report": pattern_report})
         context_state["trainer"] = trainer
         context_state["pattern_report"] = pattern_report if isinstance(pattern_report, dict) else {}
     except Exception as exc:
@@ -134,10 +166,10 @@ def format_rationale_item(title: str, raw_text):
             status = prefix.strip().replace("_", " ").title()
             detail = suffix.strip() or text
 
-    tone_source = f"{status} {detail}".upper()
-    if any(token in tone_source for token in ("NEGATIVE", "HIGH RESISTANCE", "HEAT STRESS", "STRUGGLING")):
+    tone_source = f"{status} {detail}"
+    if NEGATIVE_TONE_RE.search(tone_source):
         tone = "negative"
-    elif any(token in tone_source for token in ("ASSISTED", "COOLING EFFECT", "PERFECT", "STRONG")):
+    elif POSITIVE_TONE_RE.search(tone_source):
         tone = "positive"
     else:
         tone = "neutral"
@@ -157,7 +189,8 @@ def format_rationale_item(title: str, raw_text):
 
 
 def build_rationale_items(zone_shares: list[float], speed_kmh: Any, avg_h_r: Any) -> list[dict[str, str]]:
-    dominant_zone_idx = max(range(5), key=lambda idx: zone_shares[idx]) if zone_shares else 0
+    # list.index(max(...)) keeps the first-max tie-break without a per-item Python key call.
+    dominant_zone_idx = zone_shares.index(max(zone_shares)) if zone_shares else 0
     dominant_zone = dominant_zone_idx + 1
 
     intensity_text = f"Most of the session was spent in Z{dominant_zone} ({zone_shares[dominant_zone_idx]:.0f}%)."
@@ -204,20 +237,28 @@ def build_rationale_items(zone_shares: list[float], speed_kmh: Any, avg_h_r: Any
 
 
 def find_example_tcx_file(data_dir: str, preferred_file: str = DEFAULT_TCX_FILE) -> tuple[str, str]:
-    tcx_files = sorted([name for name in os.listdir(data_dir) if name.lower().endswith(".tcx")])
-    if not tcx_files:
+    # The preferred file is the common case and needs a single stat, not a listing and sort.
+    preferred_path = os.path.join(data_dir, preferred_file)
+    if os.path.isfile(preferred_path):
+        return preferred_file, preferred_path
+
+    # Only the alphabetically first TCX file is needed, so take the min of one scandir pass.
+    with os.scandir(data_dir) as entries:
+        first_tcx = min(
+            (entry.name for entry in entries if entry.name.lower().endswith(".tcx") and entry.is_file()),
+            default=None,
+        )
+    if first_tcx is None:
         raise FileNotFoundError(f"No TCX files found in {data_dir}")
+    return first_tcx, os.path.join(data_dir, first_tcx)
 
-    selected_file = preferred_file if preferred_file in tcx_files else tcx_files[0]
-    return selected_file, os.path.join(data_dir, selected_file)
 
-
-def build_activity_payload_from_single_tcx(data_dir: str) -> dict[str, Any]:
+def build_activity_payload_from_single_tcx(data_dir: str, context_state: dict | None = None) -> dict[str, Any]:
     parser = DataParser()
     cleaner = DataCleaner()
 
     source_file, file_path = find_example_tcx_file(data_dir)
-    exercise = parser.parse_tcx_file(file_path)
+    exercise = parser.parse_tcx_columns(file_path)
     if exercise is None:
         raise ValueError(f"Could not parse TCX file: {file_path}")
 
@@ -225,15 +266,22 @@ def build_activity_payload_from_single_tcx(data_dir: str) -> dict[str, Any]:
     if total_summary.empty:
         raise ValueError(f"No summary data generated from: {file_path}")
 
-    row = total_summary.iloc[0]
+    # Read the summary row once as a plain dict; every field below is then a native dict lookup.
+    row = total_summary.to_dict("records")[0]
     zone_shares = zone_percentages(row)
+    # Each metric is formatted once and shared by the default metrics and the page labels.
+    distance_label = format_metric(row.get("distance_km"), " km", precision=1)
+    duration_label = format_metric(row.get("duration_min"), " min", precision=0)
+    speed_label = format_metric(row.get("speed_kmh"), " km/h", precision=1)
+    heart_rate_label = format_metric(row.get("avg_h_r"), " bpm", precision=0)
+    trimp_label = format_metric(row.get("trimp_bannister"), "", precision=1)
     default_summary_metrics = {
         "source_file": source_file,
-        "distance_km": format_metric(row.get("distance_km"), " km", precision=1),
-        "duration_min": format_metric(row.get("duration_min"), " min", precision=0),
-        "avg_speed_kmh": format_metric(row.get("speed_kmh"), " km/h", precision=1),
-        "avg_heart_rate": format_metric(row.get("avg_h_r"), " bpm", precision=0),
-        "trimp_bannister": format_metric(row.get("trimp_bannister"), "", precision=1),
+        "distance_km": distance_label,
+        "duration_min": duration_label,
+        "avg_speed_kmh": speed_label,
+        "avg_heart_rate": heart_rate_label,
+        "trimp_bannister": trimp_label,
     }
     default_explanation = build_simple_explanation(row)
     default_rationales = build_rationale_items(zone_shares, row.get("speed_kmh"), row.get("avg_h_r"))
@@ -248,7 +296,9 @@ def build_activity_payload_from_single_tcx(data_dir: str) -> dict[str, Any]:
     mining_rules = []
 
     # Use the same contextual pipeline as the full dashboard, but for one selected activity page.
-    context_state = initialize_context_pipeline(data_dir)
+    # Without a context state the page shows the pandas-only defaults until the pipeline is ready.
+    if context_state is None:
+        context_error = "Contextual analysis is still loading. Refresh the page in a moment."
     if isinstance(context_state, dict):
         if context_state.get("error"):
             context_error = context_state.get("error")
@@ -281,11 +331,11 @@ def build_activity_payload_from_single_tcx(data_dir: str) -> dict[str, Any]:
         "source_file": source_file,
         "date_label": format_datetime(row.get("date"), "%b %d, %Y"),
         "start_label": format_datetime(row.get("start_time"), "%b %d, %Y %H:%M"),
-        "distance_label": format_metric(row.get("distance_km"), " km", precision=1),
-        "duration_label": format_metric(row.get("duration_min"), " min", precision=0),
-        "speed_label": format_metric(row.get("speed_kmh"), " km/h", precision=1),
-        "heart_rate_label": format_metric(row.get("avg_h_r"), " bpm", precision=0),
-        "trimp_label": format_metric(row.get("trimp_bannister"), "", precision=1),
+        "distance_label": distance_label,
+        "duration_label": duration_label,
+        "speed_label": speed_label,
+        "heart_rate_label": heart_rate_label,
+        "trimp_label": trimp_label,
         "zone_labels": [f"{pct:.0f}%" for pct in zone_shares],
         "explanation": conclusion,
         "summary_metrics": summary_metrics,
@@ -298,9 +348,28 @@ def build_activity_payload_from_single_tcx(data_dir: str) -> dict[str, Any]:
     }
 
 
+def build_context_payload(data_dir: str) -> dict[str, Any]:
+    return build_activity_payload_from_single_tcx(data_dir, initialize_context_pipeline(data_dir))
+
+
 def create_example_server() -> Flask:
-    activity = build_activity_payload_from_single_tcx(EXAMPLE_DATA_DIR)
+    # Fit/mine/explain runs in the background so the server can answer right away with the defaults.
+    context_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="context-pipeline")
+    context_payload = context_executor.submit(build_context_payload, EXAMPLE_DATA_DIR)
+    default_activity = build_activity_payload_from_single_tcx(EXAMPLE_DATA_DIR)
+    asset_version = int(os.path.getmtime(os.path.join(ASSETS_DIR, "styles.css")))
     server = Flask(__name__, template_folder=os.path.join(PROJECT_ROOT, "templates"))
+    # Templates do not change while the example runs; keep compiled bytecode across restarts.
+    server.config["TEMPLATES_AUTO_RELOAD"] = False
+    server.jinja_env.bytecode_cache = template_bytecode_cache()
+
+    # The payload only changes once (defaults -> enriched), so each variant is rendered once.
+    @lru_cache(maxsize=2)
+    def render_activity_page(enriched: bool) -> str:
+        activity = context_payload.result() if enriched else default_activity
+        return render_template(
+            "activity_detail.html", activity=activity, show_back_link=False, asset_version=asset_version
+        )
 
     @server.get("/")
     def idx():
@@ -312,16 +381,25 @@ def create_example_server() -> Flask:
             return redirect(f"/activity/{EXAMPLE_ACTIVITY_ID}")
         if activity_id != EXAMPLE_ACTIVITY_ID:
             abort(404)
-        return render_template("activity_detail.html", activity=activity, show_back_link=False)
+        return render_activity_page(context_payload.done())
 
     # activity_detail.html references /dash/assets/styles.css, so we mirror that path here.
     @server.get("/dash/assets/<path:filename>")
     def dash_assets(filename: str):
-        return send_from_directory(ASSETS_DIR, filename)
+        # Unversioned requests keep the default revalidation via ETag/Last-Modified.
+        max_age = ASSET_MAX_AGE if request.args.get("m") else None
+        return send_from_directory(ASSETS_DIR, filename, max_age=max_age)
 
     return server
 
 
 if __name__ == "__main__":
     app = create_example_server()
-    app.run(host="0.0.0.0", port=5004, debug=False)
+    # Serve with waitress when it is installed; otherwise fall back to the threaded Werkzeug server.
+    # Under gunicorn: gunicorn -w 4 -k gthread --chdir examples "activity_detail_page_example:create_example_server()"
+    try:
+        from waitress import serve
+    except ImportError:
+        app.run(host="0.0.0.0", port=5004, debug=False, threaded=True)
+    else:
+        serve(app, host="0.0.0.0", port=5004, threads=8)
@@ -18,7 +18,6 @@ DEFAULT_TARGET_FILE = "1.tcx"
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from pace_view.core import ContextTrainer
 from pace_view.config import get_weather_api_key
 
 
@@ -31,16 +30,15 @@ def print_mapping(data: dict[str, Any]):
     if not data:
         print("No data.")
         return
-    for key, value in data.items():
-        print(f"- {key}: {value}")
+    # One write per section instead of one print call per entry.
+    sys.stdout.write("".join(f"- {key}: {value}\n" for key, value in data.items()))
 
 
 def print_lines(lines: list[Any], limit: int = 5):
     if not lines:
         print("No entries.")
         return
-    for idx, line in enumerate(lines[:limit], start=1):
-        print(f"{idx}. {line}")
+    sys.stdout.write("".join(f"{idx}. {line}\n" for idx, line in enumerate(lines[:limit], start=1)))
 
 
 def resolve_target_file(history_folder: str, target_file: str | None) -> str:
@@ -50,11 +48,19 @@ def resolve_target_file(history_folder: str, target_file: str | None) -> str:
             return candidate
         raise FileNotFoundError(f"Target TCX file not found: {candidate}")
 
-    tcx_files = sorted([name for name in os.listdir(history_folder) if name.lower().endswith(".tcx")])
-    if not tcx_files:
+    default_path = os.path.join(history_folder, DEFAULT_TARGET_FILE)
+    if os.path.isfile(default_path):
+        return default_path
+
+    # Only the alphabetically first TCX file is needed, so take the min of one scandir pass.
+    with os.scandir(history_folder) as entries:
+        first_tcx = min(
+            (entry.name for entry in entries if entry.name.lower().endswith(".tcx") and entry.is_file()),
+            default=None,
+        )
+    if first_tcx is None:
         raise FileNotFoundError(f"No TCX files found in {history_folder}")
-    fallback = DEFAULT_TARGET_FILE if DEFAULT_TARGET_FILE in tcx_files else tcx_files[0]
-    return os.path.join(history_folder, fallback)
+    return os.path.join(history_folder, first_tcx)
 
 
 def parse_args():
@@ -99,6 +105,9 @@ def main():
     print(f"Weather API key set: {'yes' if weather_api_key else 'no'}")
     print(f"Weather API key source: {weather_key_source}")
 
+    # Imported here so --help and argument/path errors return without loading pandas, sklearn and NiaARM.
+    from pace_view.core import ContextTrainer
+
     trainer = ContextTrainer(
         history_folder=history_folder,
         weather_api_key=weather_api_key,
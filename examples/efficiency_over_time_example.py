@@ -4,19 +4,31 @@ Run:
     python examples/efficiency_over_time_example.py
 """
 
-import dash
-from dash import Dash, Input, Output, dcc, html
+from functools import lru_cache
 
-from plot_card_common import ASSETS_DIR, apply_theme, load_dashboard_summary
+from dash import Dash, Patch, dcc, html
+
+from plot_card_common import ASSETS_DIR, apply_theme, float32_values, load_dashboard_summary, register_range_toggle
 
 # Load once at startup; callbacks only change the rolling window.
 cleaner, total_summary = load_dashboard_summary()
 
+# Rolling-window buttons: button id -> window, and the pill label per window.
+TREND_WINDOWS = {"trend_90": 90, "trend_180": 180, "trend_365": 365}
+TREND_LABELS = {days: f"Rolling trend: {days} days" for days in TREND_WINDOWS.values()}
+# Upper bound on efficiency points sent to the browser; larger histories are LTTB-downsampled.
+EFFICIENCY_MAX_POINTS = 1500
+
+
+# Themed once; other windows only swap the trend trace, so the styled layout is never rebuilt.
+efficiency_fig = apply_theme(cleaner.efficiency_figure(total_summary, 90, max_points=EFFICIENCY_MAX_POINTS))
+
 
-def build_efficiency_figure(window_days: int):
-    """Build only figure 2 (efficiency scatter + rolling trend)."""
-    _, fig2, _, _ = cleaner.return_figures(total_summary, "7D", window_days)
-    return apply_theme(fig2)
+@lru_cache(maxsize=4)
+def efficiency_trend_line(window_days: int):
+    """Return `(name, y)` of the rolling trend trace, computed once per window."""
+    trend_trace = cleaner.efficiency_figure(total_summary, window_days, max_points=EFFICIENCY_MAX_POINTS).data[1]
+    return trend_trace.name, float32_values(trend_trace.y)
 
 
 app = Dash(
@@ -69,9 +81,10 @@ app.layout = html.Div(
                                 ),
                             ],
                         ),
+                        dcc.Store(id="trend_window", data=90),
                         dcc.Graph(
                             id="trend_fig",
-                            figure=build_efficiency_figure(90),
+                            figure=efficiency_fig,
                             config={"displayModeBar": False, "responsive": True},
                             style={"height": "100%", "minHeight": "360px"},
                         ),
@@ -83,39 +96,17 @@ app.layout = html.Div(
 )
 
 
+def trend_window_patch(window_days: int):
+    """Swap only the rolling trend trace of the already themed figure."""
+    trend_name, trend_values = efficiency_trend_line(window_days)
+    trend_patch = Patch()
+    trend_patch["data"][1]["name"] = trend_name
+    trend_patch["data"][1]["y"] = trend_values
+    return trend_patch
+
+
 # Update rolling trend window and keep button active states in sync.
-@app.callback(
-    Output("trend_fig", "figure"),
-    Output("trend_label", "children"),
-    Output("trend_90", "className"),
-    Output("trend_180", "className"),
-    Output("trend_365", "className"),
-    Input("trend_90", "n_clicks"),
-    Input("trend_180", "n_clicks"),
-    Input("trend_365", "n_clicks"),
-)
-def update_trend_window(_input_90, _input_180, _input_365):
-    triggered = dash.callback_context.triggered
-    trigger_id = triggered[0]["prop_id"].split(".")[0] if triggered else ""
-
-    if trigger_id == "trend_365":
-        window_days = 365
-        label = "Rolling trend: 365 days"
-        active = "365"
-    elif trigger_id == "trend_180":
-        window_days = 180
-        label = "Rolling trend: 180 days"
-        active = "180"
-    else:
-        window_days = 90
-        label = "Rolling trend: 90 days"
-        active = "90"
-
-    class_90 = "range-btn active" if active == "90" else "range-btn"
-    class_180 = "range-btn active" if active == "180" else "range-btn"
-    class_365 = "range-btn active" if active == "365" else "range-btn"
-
-    return build_efficiency_figure(window_days), label, class_90, class_180, class_365
+register_range_toggle(app, TREND_WINDOWS, TREND_LABELS, "trend_label", "trend_window", "trend_fig", trend_window_patch)
 
 
 if __name__ == "__main__":
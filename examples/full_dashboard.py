@@ -1,24 +1,106 @@
 """Standalone dashboard entrypoint for PACE-VIEW."""
 
+import hashlib
+import json
 import logging
 import os
+import re
+import secrets
 import sys
+from dataclasses import dataclass, field
+from functools import lru_cache
+from importlib.util import find_spec
 
 # Allow running this module directly from examples/ while importing project packages.
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, ".."))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
 
 import dash
+import numpy as np
 import pandas as pd
-from dash import Dash, html, dcc, Input, Output
-from flask import Flask, abort, redirect, render_template
+from dash import Dash, html, dcc, Input, Output, Patch, State
+from flask import Flask, abort, redirect, request, stream_template
 from pace_view.config import get_weather_api_key
 from pace_view.data_parsing import DataParser
 from pace_view.data_cleaning import DataCleaner
+from plot_card_common import (
+    SUMMARY_CACHE_DIR,
+    apply_theme,
+    context_cache_path,
+    float32_values,
+    list_tcx_files,
+    load_context_cache,
+    load_exercises_with_filenames,
+    prune_cache_files,
+    register_range_toggle,
+    save_context_cache,
+    summary_cache_key,
+    template_bytecode_cache,
+)
 
 LOGGER = logging.getLogger(__name__)
+ZONE_COLUMNS = [f"z{zone}_sec" for zone in range(1, 6)]
+EXPLANATION_COLUMNS = ["distance_km", "duration_min", "speed_kmh", "avg_h_r"]
+# Display label column -> (metric column, suffix, precision), formatted once per activity table.
+METRIC_LABEL_COLUMNS = {
+    "distance_label": ("distance_km", " km", 1),
+    "duration_label": ("duration_min", " min", 0),
+    "speed_label": ("speed_kmh", " km/h", 1),
+    "heart_rate_label": ("avg_h_r", " bpm", 0),
+    "trimp_label": ("trimp_bannister", "", 1),
+}
+INTENSITY_SENTENCES = (
+    "This was a demanding effort with extended high-intensity work (Z4-Z5).",
+    "Intensity stayed mostly aerobic (Z1-Z2), indicating an endurance-focused ride.",
+    "The ride kept a balanced intensity profile across aerobic and threshold zones.",
+)
+EFFICIENCY_SENTENCES = (
+    "Efficiency was strong for the recorded heart rate.",
+    "Efficiency was moderate for the recorded heart rate.",
+    "Speed to heart-rate efficiency was low compared with usual endurance pacing.",
+)
+# Keywords that decide a rationale's tone, matched case-insensitively in one scan each.
+NEGATIVE_TONE_RE = re.compile(r"NEGATIVE|HIGH RESISTANCE|HEAT STRESS|STRUGGLING", re.IGNORECASE)
+POSITIVE_TONE_RE = re.compile(r"ASSISTED|COOLING EFFECT|PERFECT|STRONG", re.IGNORECASE)
+# Zone mix period buttons: button id -> period, and the pill label per period.
+RANGE_PERIODS = {"1_week": "7D", "1_month": "30D", "1_year": "365D"}
+RANGE_LABELS = {"7D": "Aggregated by 7 days", "30D": "Aggregated by 30 days", "365D": "Aggregated by 12 months"}
+# Rolling-window buttons: button id -> window, and the pill label per window.
+TREND_WINDOWS = {"trend_90": 90, "trend_180": 180, "trend_365": 365}
+TREND_LABELS = {days: f"Rolling trend: {days} days" for days in TREND_WINDOWS.values()}
+# Upper bound on efficiency points sent to the browser; larger histories are LTTB-downsampled.
+EFFICIENCY_MAX_POINTS = 1500
+# Activity cards rendered per expand / "Show more" click so the list payload stays bounded.
+ACTIVITY_LIST_PAGE_SIZE = 200
+# Most recent per-activity context reports kept in memory.
+ACTIVITY_REPORT_CACHE_SIZE = 256
+# Seconds a browser may reuse an activity page before revalidating it with its ETag.
+ACTIVITY_PAGE_MAX_AGE = 60
+# Activity table columns the detail route reads, kept as plain Python lists.
+ACTIVITY_DETAIL_COLUMNS = [
+    "activity_id",
+    "source_file",
+    "explanation",
+    "date_label",
+    "start_label",
+    *METRIC_LABEL_COLUMNS,
+]
+# Half-width floats are plenty for plotted values and halve what the figures serialize.
+COMPACT_FLOAT_COLUMNS = [
+    "duration_s",
+    "distance_km",
+    "avg_h_r",
+    "avg_speed_mps",
+    "trimp_bannister",
+    "trimp_edwards",
+    *(f"z{k}_sec" for k in range(1, 6)),
+    "speed_kmh",
+    "duration_min",
+]
 
 
 def format_metric(value, suffix="", precision=1):
@@ -27,106 +109,207 @@ def format_metric(value, suffix="", precision=1):
     return f"{value:,.{precision}f}{suffix}"
 
 
-def format_datetime(value, date_format):
-    timestamp = pd.to_datetime(value, errors="coerce")
-    if pd.isna(timestamp):
-        return "N/A"
-    return timestamp.strftime(date_format)
+def format_metric_column(values: pd.Series, suffix="", precision=1) -> pd.Series:
+    """format_metric for a whole column; missing or non-numeric values become "N/A"."""
+    numbers = pd.to_numeric(values, errors="coerce")
+    labels = [f"{value:,.{precision}f}{suffix}" for value in numbers.tolist()]
+    return pd.Series(labels, index=values.index, dtype=object).mask(numbers.isna(), "N/A")
 
 
-def zone_percentages(activity_row):
-    zone_seconds = []
-    for zone in range(1, 6):
-        raw_value = activity_row.get(f"z{zone}_sec", 0)
-        if raw_value is None or pd.isna(raw_value):
-            zone_seconds.append(0.0)
-        else:
-            zone_seconds.append(float(raw_value))
-
-    total_seconds = sum(zone_seconds)
-    if total_seconds <= 0:
-        return [0.0] * 5
-    return [seconds / total_seconds * 100.0 for seconds in zone_seconds]
-
-
-def build_activity_explanation(activity_row):
-    details = []
-
-    distance_km = activity_row.get("distance_km")
-    duration_min = activity_row.get("duration_min")
-    speed_kmh = activity_row.get("speed_kmh")
-    avg_h_r = activity_row.get("avg_h_r")
-
-    if pd.notna(distance_km) and pd.notna(duration_min):
-        details.append(f"Covered {distance_km:.1f} km in {duration_min:.0f} minutes.")
-    elif pd.notna(distance_km):
-        details.append(f"Covered {distance_km:.1f} km.")
-    elif pd.notna(duration_min):
-        details.append(f"Workout duration was {duration_min:.0f} minutes.")
-
-    zone_shares = zone_percentages(activity_row)
-    if sum(zone_shares) > 0:
-        dominant_zone_index = max(range(5), key=lambda idx: zone_shares[idx])
-        dominant_zone = dominant_zone_index + 1
-        details.append(
-            f"Main intensity was in Z{dominant_zone} ({zone_shares[dominant_zone_index]:.0f}% of zone time)."
-        )
+def format_datetime_column(values: pd.Series, date_format: str) -> pd.Series:
+    # build_dashboard already types start_time and date; only other columns need coercion.
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        values = pd.to_datetime(values, errors="coerce")
+    return values.dt.strftime(date_format).fillna("N/A")
 
-        hard_share = zone_shares[3] + zone_shares[4]
-        easy_share = zone_shares[0] + zone_shares[1]
-        if hard_share >= 35:
-            details.append("This was a demanding effort with extended high-intensity work (Z4-Z5).")
-        elif easy_share >= 65:
-            details.append("Intensity stayed mostly aerobic (Z1-Z2), indicating an endurance-focused ride.")
-        else:
-            details.append("The ride kept a balanced intensity profile across aerobic and threshold zones.")
-
-    if pd.notna(speed_kmh) and pd.notna(avg_h_r) and avg_h_r > 0:
-        efficiency = speed_kmh / avg_h_r
-        if efficiency >= 0.19:
-            details.append("Efficiency was strong for the recorded heart rate.")
-        elif efficiency >= 0.15:
-            details.append("Efficiency was moderate for the recorded heart rate.")
-        else:
-            details.append("Speed to heart-rate efficiency was low compared with usual endurance pacing.")
 
-    if not details:
-        return "Not enough information to build an explanation for this activity."
+def zone_percentages_matrix(activity_table: pd.DataFrame) -> np.ndarray:
+    """Share of zone time per activity in percent, one row of five zones per activity."""
+    zone_seconds = activity_table.reindex(columns=ZONE_COLUMNS).to_numpy(dtype=float, na_value=0.0)
+    total_seconds = zone_seconds.sum(axis=1, keepdims=True)
+    return np.divide(
+        zone_seconds * 100.0, total_seconds, out=np.zeros_like(zone_seconds), where=total_seconds > 0
+    )
+
+
+def zone_labels_matrix(zone_shares: np.ndarray) -> np.ndarray:
+    """Whole-percent labels ("42%") for a zone share matrix; rint rounds half to even like f"{pct:.0f}"."""
+    return np.char.add(np.rint(zone_shares).astype(np.int64).astype(str), "%")
 
-    return " ".join(details)
+
+def build_activity_explanations(activity_table: pd.DataFrame) -> list[str]:
+    """Explanation sentence for every activity row, reading each metric column once as an array."""
+    distance_km, duration_min, speed_kmh, avg_h_r = (
+        activity_table.reindex(columns=EXPLANATION_COLUMNS).to_numpy(dtype=float, na_value=np.nan).T
+    )
+    zone_shares = zone_percentages_matrix(activity_table)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        efficiency = np.where(avg_h_r > 0, speed_kmh / avg_h_r, np.nan)
+    dominant_zone_index = zone_shares.argmax(axis=1)
+    hard_share = zone_shares[:, 3] + zone_shares[:, 4]
+    easy_share = zone_shares[:, 0] + zone_shares[:, 1]
+    has_zones = zone_shares.sum(axis=1) > 0
+    dominant_share = np.take_along_axis(zone_shares, dominant_zone_index[:, None], axis=1)[:, 0]
+    # Bucket every row in one pass; the loop below only picks sentences by code.
+    intensity_code = np.select(
+        [~has_zones, hard_share >= 35, easy_share >= 65], [-1, 0, 1], default=2
+    ).astype(np.int8)
+    with np.errstate(invalid="ignore"):
+        efficiency_code = np.select(
+            [np.isnan(efficiency), efficiency >= 0.19, efficiency >= 0.15], [-1, 0, 1], default=2
+        ).astype(np.int8)
+
+    has_distance = ~np.isnan(distance_km)
+    has_duration = ~np.isnan(duration_min)
+    volume_code = np.select(
+        [has_distance & has_duration, has_distance, has_duration], [0, 1, 2], default=-1
+    ).astype(np.int8)
+
+    # Walk plain Python floats: indexing NumPy arrays per row would box a scalar on every access.
+    rows = zip(
+        distance_km.tolist(),
+        duration_min.tolist(),
+        volume_code.tolist(),
+        (dominant_zone_index + 1).tolist(),
+        dominant_share.tolist(),
+        intensity_code.tolist(),
+        efficiency_code.tolist(),
+    )
+    explanations = []
+    for distance, duration, volume, dominant_zone, dominant_pct, intensity, efficiency_level in rows:
+        details = []
+
+        if volume == 0:
+            details.append(f"Covered {distance:.1f} km in {duration:.0f} minutes.")
+        elif volume == 1:
+            details.append(f"Covered {distance:.1f} km.")
+        elif volume == 2:
+            details.append(f"Workout duration was {duration:.0f} minutes.")
+
+        if intensity >= 0:
+            details.append(f"Main intensity was in Z{dominant_zone} ({dominant_pct:.0f}% of zone time).")
+            details.append(INTENSITY_SENTENCES[intensity])
+
+        if efficiency_level >= 0:
+            details.append(EFFICIENCY_SENTENCES[efficiency_level])
+
+        if not details:
+            explanations.append("Not enough information to build an explanation for this activity.")
+        else:
+            explanations.append(" ".join(details))
+    return explanations
 
 
 def build_activity_table(total_summary: pd.DataFrame) -> pd.DataFrame:
     activity_table = (
-        total_summary.copy()
+        # summary_row remembers each activity's position in total_summary for id lookups.
+        total_summary.assign(summary_row=np.arange(len(total_summary)))
         .sort_values("start_time", ascending=False)
         .reset_index(drop=True)
     )
     if "source_file" not in activity_table.columns:
         activity_table["source_file"] = None
     activity_table["activity_id"] = activity_table.index
-    activity_table["explanation"] = activity_table.apply(build_activity_explanation, axis=1)
+    activity_table["explanation"] = build_activity_explanations(activity_table)
+    # Date labels for the list cards and detail pages, formatted for the whole column at once.
+    activity_table["date_label"] = format_datetime_column(activity_table["date"], "%b %d, %Y")
+    activity_table["start_label"] = format_datetime_column(activity_table["start_time"], "%b %d, %Y %H:%M")
+    for label_column, (value_column, suffix, precision) in METRIC_LABEL_COLUMNS.items():
+        activity_table[label_column] = format_metric_column(
+            activity_table.reindex(columns=[value_column])[value_column], suffix, precision=precision
+        )
     return activity_table
 
 
-def load_exercises_with_filenames(parser: DataParser, directory_name: str):
-    file_names = sorted([f for f in os.listdir(directory_name) if f.lower().endswith(".tcx")])
-    exercises = []
-    for file_name in file_names:
-        file_path = os.path.join(directory_name, file_name)
+def compute_kpis(total_summary: pd.DataFrame) -> dict:
+    """All-time KPI scalars for the dashboard header, as JSON-friendly values."""
+    # Reduce all KPI columns in one agg call instead of one pass per metric.
+    kpis = total_summary.agg(
+        {
+            "distance_km": "sum",
+            "duration_min": "sum",
+            "speed_kmh": "mean",
+            "avg_h_r": "mean",
+            "date": ["min", "max"],
+        }
+    )
+    data_start = kpis.at["min", "date"]
+    data_end = kpis.at["max", "date"]
+    return {
+        "total_sessions": int(len(total_summary)),
+        "total_distance_km": float(kpis.at["sum", "distance_km"]),
+        "total_time_hours": float(kpis.at["sum", "duration_min"]) / 60.0,
+        "avg_speed_kmh": float(kpis.at["mean", "speed_kmh"]),
+        "avg_hr": float(kpis.at["mean", "avg_h_r"]),
+        "data_start": data_start.isoformat() if pd.notna(data_start) else None,
+        "data_end": data_end.isoformat() if pd.notna(data_end) else None,
+    }
+
+
+def compact_summary(total_summary: pd.DataFrame) -> pd.DataFrame:
+    """Downcast display-only floats to float32 and repeated period labels to categories."""
+    float_cols = [col for col in COMPACT_FLOAT_COLUMNS if col in total_summary.columns]
+    total_summary[float_cols] = total_summary[float_cols].astype("float32")
+    for col in ("week", "month"):
+        if col in total_summary.columns:
+            total_summary[col] = total_summary[col].astype("category")
+    return total_summary
+
+
+@lru_cache(maxsize=4)
+def _cached_dashboard_summary(directory_name: str, cache_key: str):
+    """Per-process memo of `(total_summary, kpis)` for one content key of the data folder."""
+    cache_dir = os.path.join(directory_name, SUMMARY_CACHE_DIR)
+    summary_path = os.path.join(cache_dir, f"{cache_key}.pkl")
+    kpis_path = os.path.join(cache_dir, f"{cache_key}.kpis.json")
+
+    # The pickled frame is already compacted, so KPIs are only ever taken from the file written next to it;
+    # if either file is missing or unreadable, both are rebuilt from the full-precision summary.
+    if os.path.exists(summary_path) and os.path.exists(kpis_path):
         try:
-            exercise = parser.parse_tcx_file(file_path)
-            if exercise is not None:
-                exercises.append((file_name, exercise))
+            total_summary = pd.read_pickle(summary_path)
+            with open(kpis_path, encoding="utf-8") as handle:
+                kpis = json.load(handle)
         except Exception as exc:
-            LOGGER.warning("Skipping unreadable file %s: %s", file_name, exc)
-    return exercises, file_names
+            LOGGER.warning("Ignoring unreadable summary cache %s: %s", summary_path, exc)
+        else:
+            return total_summary, kpis
+
+    # Per-file parse cache: when one TCX file changes, only that file is parsed again.
+    parser = DataParser(cache_dir=os.path.join(directory_name, SUMMARY_CACHE_DIR, "tcx"))
+    # Parsed in this process: create_dash_app runs while the module is imported, and under the "spawn"
+    # start method (macOS, Windows) pool workers cannot bootstrap from a half-imported main module.
+    exercises = load_exercises_with_filenames(parser, directory_name)
+    total_summary = DataCleaner().build_dashboard(exercises)
+    # KPIs are reduced at full precision before the frame is compacted for the figures.
+    kpis = compute_kpis(total_summary)
+    total_summary = compact_summary(total_summary)
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        total_summary.to_pickle(summary_path)
+        with open(kpis_path, "w", encoding="utf-8") as handle:
+            json.dump(kpis, handle)
+        # Drop summaries from older keys: changed TCX files or an older CACHE_VERSION.
+        prune_cache_files(cache_dir, cache_key, (".pkl", ".kpis.json"))
+    except OSError as exc:
+        LOGGER.warning("Could not write summary cache in %s: %s", cache_dir, exc)
+    return total_summary, kpis
+
+
+def load_dashboard_summary(directory_name: str):
+    """Return `(total_summary, file_names, kpis)`, shared per process and on disk while no TCX file changed.
+
+    The returned frame is shared between callers and must be treated as read-only.
+    """
+    file_names = list_tcx_files(directory_name)
+    total_summary, kpis = _cached_dashboard_summary(directory_name, summary_cache_key(directory_name, file_names))
+    return total_summary, file_names, kpis
 
 
 def get_triggered_input_id() -> str:
     """Return the Dash input id that triggered the current callback."""
-    trigger = dash.callback_context.triggered
-    return trigger[0]["prop_id"].split(".")[0] if trigger else ""
+    return dash.ctx.triggered_id or ""
 
 
 def extract_activity_id_from_click(click_data):
@@ -136,28 +319,34 @@ def extract_activity_id_from_click(click_data):
     for point in click_data["points"]:
         custom_data = point.get("customdata")
         candidate = custom_data[0] if isinstance(custom_data, (list, tuple)) and custom_data else custom_data
-        if candidate is None or pd.isna(candidate):
+        # Click payloads are decoded JSON, so a self-inequality check is enough to spot NaN.
+        if candidate is None or candidate != candidate:
             continue
         try:
             return int(candidate)
-        except (TypeError, ValueError):
+        except (TypeError, ValueError, OverflowError):
             continue
     return None
 
 
-def initialize_context_pipeline(history_folder: str):
-    context_state = {
-        "trainer": None,
-        "pattern_report": {},
-        "activity_report_cache": {},
-        "error": None,
-        "_initialized": True,
-    }
+@dataclass(slots=True)
+class ContextState:
+    """Context pipeline output shared by every activity detail request."""
+
+    trainer: object = None
+    pattern_report: dict = field(default_factory=dict)
+    # lru_cache-wrapped trainer.explain, created on the first report request.
+    activity_report_cache: object = None
+    error: str | None = None
+
+
+def initialize_context_pipeline(history_folder: str) -> ContextState:
+    context_state = ContextState()
 
     try:
         from pace_view.core import ContextTrainer
     except Exception as exc:
-        context_state["error"] = f"Context pipeline import failed: {exc}"
+        context_state.error = f"Context pipeline import failed: {exc}"
         return context_state
 
     try:
@@ -165,31 +354,38 @@ def initialize_context_pipeline(history_folder: str):
             history_folder=history_folder,
             weather_api_key=get_weather_api_key(),
         )
-        trainer.fit()
-        pattern_report = trainer.mine_patterns()
-
-        context_state["trainer"] = trainer
-        context_state["pattern_report"] = pattern_report if isinstance(pattern_report, dict) else {}
+        # Reuse the fitted twin and mined rules while the TCX files are unchanged.
+        # Only the model is stored so the weather API key never lands on disk.
+        use_cache = os.getenv("PACE_DISABLE_CACHE") != "1"
+        cache_path = context_cache_path(history_folder, trainer.model.model)
+        cached = load_context_cache(cache_path) if use_cache else None
+        if cached is not None:
+            trainer.model = cached["model"]
+            trainer.counterfactual.model = cached["model"]
+            pattern_report = cached["pattern_report"]
+        else:
+            # Parsing the history is per-file work, so spread it over the available cores.
+            trainer.fit(workers=os.cpu_count() or 1)
+            pattern_report = trainer.mine_patterns()
+            if use_cache:
+                save_context_cache(cache_path, {"model": trainer.model, "pattern_report": pattern_report})
+
+        context_state.trainer = trainer
+        context_state.pattern_report = pattern_report if isinstance(pattern_report, dict) else {}
     except Exception as exc:
-        context_state["error"] = f"Context pipeline initialization failed: {exc}"
+        context_state.error = f"Context pipeline initialization failed: {exc}"
 
     return context_state
 
 
-def ensure_context_pipeline(server: Flask):
+def ensure_context_pipeline(server: Flask) -> ContextState:
     context_state = server.config.get("CONTEXT_PIPELINE")
-    if isinstance(context_state, dict) and context_state.get("_initialized"):
+    if context_state is not None:
         return context_state
 
     history_folder = server.config.get("DATA_DIRECTORY", "")
     if not history_folder:
-        context_state = {
-            "trainer": None,
-            "pattern_report": {},
-            "activity_report_cache": {},
-            "error": "Data directory is not configured.",
-            "_initialized": True,
-        }
+        context_state = ContextState(error="Data directory is not configured.")
     else:
         context_state = initialize_context_pipeline(history_folder)
 
@@ -197,19 +393,19 @@ def ensure_context_pipeline(server: Flask):
     return context_state
 
 
-def get_context_activity_report(context_state: dict, file_path: str):
-    trainer = context_state.get("trainer")
+def get_context_activity_report(context_state: ContextState, file_path: str):
+    trainer = context_state.trainer
     if trainer is None:
-        return None, context_state.get("error") or "Digital twin model is not available."
+        return None, context_state.error or "Digital twin model is not available."
 
-    cache = context_state.setdefault("activity_report_cache", {})
-    if file_path in cache:
-        return cache[file_path], None
+    # Bounded per trainer, so a long-running dashboard keeps at most the most recent reports.
+    explain = context_state.activity_report_cache
+    if explain is None:
+        explain = lru_cache(maxsize=ACTIVITY_REPORT_CACHE_SIZE)(trainer.explain)
+        context_state.activity_report_cache = explain
 
     try:
-        report = trainer.explain(file_path)
-        cache[file_path] = report
-        return report, None
+        return explain(file_path), None
     except Exception as exc:
         return None, f"Activity explanation failed: {exc}"
 
@@ -225,10 +421,10 @@ def format_rationale_item(title: str, raw_text):
             status = prefix.strip().replace("_", " ").title()
             detail = suffix.strip() or text
 
-    tone_source = f"{status} {detail}".upper()
-    if any(token in tone_source for token in ("NEGATIVE", "HIGH RESISTANCE", "HEAT STRESS", "STRUGGLING")):
+    tone_source = f"{status} {detail}"
+    if NEGATIVE_TONE_RE.search(tone_source):
         tone = "negative"
-    elif any(token in tone_source for token in ("ASSISTED", "COOLING EFFECT", "PERFECT", "STRONG")):
+    elif POSITIVE_TONE_RE.search(tone_source):
         tone = "positive"
     else:
         tone = "neutral"
@@ -249,24 +445,54 @@ def format_rationale_item(title: str, raw_text):
 def create_flask_server() -> Flask:
     # Flask serves the Dash app shell and the dedicated activity detail page.
     server = Flask(__name__, template_folder=os.path.join(PROJECT_ROOT, "templates"))
-    server.config["ACTIVITY_TABLE"] = pd.DataFrame()
+    # Compiled template bytecode survives restarts; auto-reload still follows debug mode.
+    server.jinja_env.bytecode_cache = template_bytecode_cache()
+    server.config["ACTIVITY_COLUMNS"] = {column: [] for column in ACTIVITY_DETAIL_COLUMNS}
+    server.config["ZONE_LABELS"] = np.empty((0, len(ZONE_COLUMNS)), dtype=str)
     server.config["DATA_DIRECTORY"] = ""
-    server.config["CONTEXT_PIPELINE"] = {"_initialized": False}
+    server.config["ACTIVITY_REVISION"] = ""
+    # New on every start, so activity pages cached before a redeploy, template change or model refit revalidate.
+    server.config["BOOT_TOKEN"] = secrets.token_hex(8)
+    server.config["CONTEXT_PIPELINE"] = None
 
     @server.get("/")
     def idx():
         return redirect("/dash/")
 
+    @server.get("/dash/_cache_stats")
+    def cache_stats():
+        # Debug aid only: internal cache state is not exposed unless the server runs in debug mode.
+        if not server.debug:
+            abort(404)
+        stats = {"dashboard_summary": _cached_dashboard_summary.cache_info()._asdict()}
+        context_state = server.config["CONTEXT_PIPELINE"]
+        if context_state is not None and context_state.activity_report_cache is not None:
+            stats["activity_report"] = context_state.activity_report_cache.cache_info()._asdict()
+        return stats
+
+    def with_validators(response, etag: str):
+        response.set_etag(etag)
+        response.cache_control.private = True
+        response.cache_control.max_age = ACTIVITY_PAGE_MAX_AGE
+        return response
+
     @server.get("/activity/<int:activity_id>")
     def activity_detail(activity_id: int):
-        activity_table = server.config.get("ACTIVITY_TABLE")
-        if activity_table is None or activity_table.empty:
-            abort(404)
-        if activity_id < 0 or activity_id >= len(activity_table):
+        activity_columns = server.config["ACTIVITY_COLUMNS"]
+        if activity_id < 0 or activity_id >= len(activity_columns["activity_id"]):
             abort(404)
 
-        row = activity_table.iloc[activity_id]
-        zone_shares = zone_percentages(row)
+        # Load contextual model output lazily to avoid expensive startup work.
+        context_state = ensure_context_pipeline(server)
+        # Within one server process the page only changes with the TCX files and whether the context model loaded.
+        model_loaded = context_state.trainer is not None
+        revision = f"{server.config['BOOT_TOKEN']}:{server.config['ACTIVITY_REVISION']}:{activity_id}:{model_loaded}"
+        etag = hashlib.blake2b(revision.encode(), digest_size=8).hexdigest()
+        if context_state.error is None and etag in request.if_none_match:
+            return with_validators(server.response_class(status=304), etag)
+
+        # Pick this activity's values out of the column lists; no Series is built per request.
+        row = {column: values[activity_id] for column, values in activity_columns.items()}
         default_explanation = row.get("explanation")
         if default_explanation is None or pd.isna(default_explanation):
             default_explanation = "No explanation available."
@@ -280,15 +506,13 @@ def create_flask_server() -> Flask:
         mining_insights = []
         mining_rules = []
 
-        # Load contextual model output lazily to avoid expensive startup work.
-        context_state = ensure_context_pipeline(server)
         data_directory = server.config.get("DATA_DIRECTORY", "")
         source_file = row.get("source_file")
         source_file_label = source_file if isinstance(source_file, str) and source_file else "N/A"
 
-        if isinstance(context_state, dict):
-            if context_state.get("error"):
-                context_error = context_state.get("error")
+        if isinstance(context_state, ContextState):
+            if context_state.error:
+                context_error = context_state.error
 
             if isinstance(source_file, str) and source_file:
                 file_path = os.path.join(data_directory, source_file)
@@ -308,7 +532,7 @@ def create_flask_server() -> Flask:
                 else:
                     context_error = context_error or f"Source file not found: {source_file}"
 
-            pattern_report = context_state.get("pattern_report")
+            pattern_report = context_state.pattern_report
             if isinstance(pattern_report, dict) and pattern_report:
                 mining_summary = pattern_report.get("Summary", mining_summary)
                 mining_explanation = pattern_report.get("Explanation", "")
@@ -318,14 +542,14 @@ def create_flask_server() -> Flask:
         activity = {
             "id": int(row["activity_id"]),
             "source_file": source_file_label,
-            "date_label": format_datetime(row.get("date"), "%b %d, %Y"),
-            "start_label": format_datetime(row.get("start_time"), "%b %d, %Y %H:%M"),
-            "distance_label": format_metric(row.get("distance_km"), " km", precision=1),
-            "duration_label": format_metric(row.get("duration_min"), " min", precision=0),
-            "speed_label": format_metric(row.get("speed_kmh"), " km/h", precision=1),
-            "heart_rate_label": format_metric(row.get("avg_h_r"), " bpm", precision=0),
-            "trimp_label": format_metric(row.get("trimp_bannister"), "", precision=1),
-            "zone_labels": [f"{pct:.0f}%" for pct in zone_shares],
+            "date_label": row["date_label"],
+            "start_label": row["start_label"],
+            "distance_label": row["distance_label"],
+            "duration_label": row["duration_label"],
+            "speed_label": row["speed_label"],
+            "heart_rate_label": row["heart_rate_label"],
+            "trimp_label": row["trimp_label"],
+            "zone_labels": server.config["ZONE_LABELS"][activity_id].tolist(),
             "explanation": conclusion,
             "summary_metrics": summary_metrics,
             "rationale_items": rationale_items,
@@ -336,7 +560,12 @@ def create_flask_server() -> Flask:
             "context_error": context_error,
         }
 
-        return render_template("activity_detail.html", activity=activity)
+        # Stream so the browser can start on <head> (and the stylesheet) while the body renders.
+        page = stream_template("activity_detail.html", activity=activity)
+        if context_error is not None:
+            # Error pages are never validated or cached, so a later successful render replaces them.
+            return server.response_class(page)
+        return with_validators(server.response_class(page), etag)
 
     return server
 
@@ -347,116 +576,108 @@ def create_dash_app(server: Flask) -> Dash:
         url_base_pathname="/dash/",
         assets_folder=os.path.join(PROJECT_ROOT, "assets"),
         suppress_callback_exceptions=True,
+        # Gzip callback and page responses when flask-compress is installed (dash[compress]).
+        compress=find_spec("flask_compress") is not None,
         meta_tags=[{"name": "viewport", "content": "width=device-width, initial-scale=1"}],
     )
 
-    # Load and preprocess activity data once during app bootstrap.
+    # Load and preprocess activity data once, reusing the cached summary when possible.
     directory_name = os.path.join(PROJECT_ROOT,"examples", "data")
-    parser = DataParser()
     cleaner = DataCleaner()
-    exercises, file_names = load_exercises_with_filenames(parser, directory_name)
-
-    total_summary = cleaner.build_dashboard(exercises)
+    total_summary, file_names, kpis = load_dashboard_summary(directory_name)
     activity_table = build_activity_table(total_summary)
-    total_summary_with_ids = total_summary.merge(
-        activity_table[["activity_id", "start_time", "source_file"]],
-        on=["start_time", "source_file"],
-        how="left",
-    )
-    server.config["ACTIVITY_TABLE"] = activity_table
+    # activity_table is total_summary reordered, so ids scatter back by position without a merge.
+    activity_ids = np.empty(len(activity_table), dtype=np.int64)
+    activity_ids[activity_table["summary_row"].to_numpy()] = activity_table["activity_id"].to_numpy()
+    total_summary_with_ids = total_summary.assign(activity_id=activity_ids).reset_index(drop=True)
+    server.config["ACTIVITY_COLUMNS"] = {
+        column: activity_table[column].tolist() for column in ACTIVITY_DETAIL_COLUMNS
+    }
+    # Zone labels for every activity, so the detail page only slices its row.
+    server.config["ZONE_LABELS"] = zone_labels_matrix(zone_percentages_matrix(activity_table))
     server.config["DATA_DIRECTORY"] = directory_name
-    server.config["CONTEXT_PIPELINE"] = {"_initialized": False}
-
-    def apply_theme(fig):
-        fig.update_layout(
-            template="plotly_white",
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            font=dict(family="DM Sans", color="#0f172a"),
-            title=dict(font=dict(family="Space Grotesk", size=18), x=0.02, xanchor="left"),
-            margin=dict(l=40, r=28, t=56, b=40),
-            colorway=["#0f172a", "#334155", "#64748b", "#94a3b8", "#0ea5a4"],
-            hoverlabel=dict(bgcolor="#0f172a", font=dict(color="#ffffff", family="DM Sans")),
-        )
-        fig.update_xaxes(showgrid=True, gridcolor="rgba(15, 23, 42, 0.08)", zeroline=False)
-        fig.update_yaxes(showgrid=True, gridcolor="rgba(15, 23, 42, 0.08)", zeroline=False)
-        fig.update_traces(marker=dict(line=dict(width=0)), selector=dict(type="scatter"))
-
-        if fig.data:
-            fig_type = fig.data[0].type
-            if fig_type == "pie":
-                fig.update_traces(
-                    hole=0.5,
-                    textinfo="percent+label",
-                    marker=dict(line=dict(color="#ffffff", width=1)),
-                    domain=dict(x=[0.15, 0.85], y=[0.1, 0.9]),
-                    selector=dict(type="pie"),
-                )
-                fig.update_layout(showlegend=False)
-            if fig_type == "heatmap":
-                fig.update_layout(
-                    coloraxis_colorscale=[[0, "#e2e8f0"], [0.5, "#94a3b8"], [1, "#0f172a"]],
-                    coloraxis_colorbar=dict(title="Avg HR"),
-                )
-        fig.update_traces(marker=dict(size=7, opacity=0.8), selector=dict(mode="markers"))
-        fig.update_traces(line=dict(width=3), selector=dict(mode="lines"))
-        return fig
-
-    def themed_figures(period: str):
-        fig1, fig2, fig3, fig4 = cleaner.return_figures(total_summary_with_ids, period)
-        return (
-            apply_theme(fig1),
-            apply_theme(fig2),
-            apply_theme(fig3),
-            apply_theme(fig4),
-        )
+    server.config["ACTIVITY_REVISION"] = summary_cache_key(directory_name, file_names)
+    server.config["CONTEXT_PIPELINE"] = None
+
+    # Only the zone mix depends on the period and only three periods are selectable.
+    # The callback patches the pie values in place, so compute all of them up front.
+    zone_mix_values = {
+        period: cleaner.hr_zones_summary(total_summary_with_ids, period)["value"].tolist()
+        for period in RANGE_PERIODS.values()
+    }
 
-    fig1, fig2, _, fig4 = themed_figures("7D")
+    fig1 = apply_theme(cleaner.zone_mix_figure(total_summary_with_ids, "7D"))
+    fig2 = apply_theme(
+        cleaner.efficiency_figure(total_summary_with_ids, 90, max_points=EFFICIENCY_MAX_POINTS)
+    )
 
-    total_sessions = int(len(total_summary))
-    total_distance_km = total_summary["distance_km"].sum()
-    total_time_hours = total_summary["duration_min"].sum() / 60.0
-    avg_speed_kmh = total_summary["speed_kmh"].mean()
-    avg_hr = total_summary["avg_h_r"].mean()
-    last_activity = total_summary["date"].max()
+    # Only the rolling trend line (trace 1) depends on the window: the scatter, the downsampled
+    # dates and the layout are shared, so keep just that line per window and patch it in.
+    trend_lines = {90: (fig2.data[1].name, fig2.data[1].y)}
+
+    def efficiency_trend_line(window_days: int):
+        if window_days not in trend_lines:
+            trend_trace = cleaner.efficiency_figure(
+                total_summary_with_ids, window_days, max_points=EFFICIENCY_MAX_POINTS
+            ).data[1]
+            trend_lines[window_days] = (trend_trace.name, float32_values(trend_trace.y))
+        return trend_lines[window_days]
+
+    fig4 = apply_theme(cleaner.heatmap_figure(total_summary_with_ids))
+    # Dash re-serializes the layout on every page load; plain figure dicts skip the per-request
+    # graph_objects conversion there and encode to the same JSON.
+    fig1, fig2, fig4 = (fig.to_plotly_json() for fig in (fig1, fig2, fig4))
+
+    total_sessions = kpis["total_sessions"]
+    total_distance_km = kpis["total_distance_km"]
+    total_time_hours = kpis["total_time_hours"]
+    avg_speed_kmh = kpis["avg_speed_kmh"]
+    avg_hr = kpis["avg_hr"]
+    last_activity = pd.to_datetime(kpis["data_end"])
     last_activity_label = last_activity.strftime("%b %d, %Y") if pd.notna(last_activity) else "N/A"
-    data_start = total_summary["date"].min()
-    data_end = total_summary["date"].max()
+    data_start = pd.to_datetime(kpis["data_start"])
+    data_end = last_activity
     data_range_label = (
         f"{data_start.strftime('%b %d, %Y')} - {data_end.strftime('%b %d, %Y')}"
         if pd.notna(data_start) and pd.notna(data_end)
         else "N/A"
     )
     file_count = len(file_names)
-    activity_records = activity_table.to_dict("records")
-
-    activity_list_items = [
-        html.Div(
-            className="activity-list__item",
-            children=[
-                html.A(
-                    href=f"/activity/{int(record['activity_id'])}",
-                    className="activity-list__link",
-                    children=[
-                        html.Div(
-                            format_datetime(record.get("start_time"), "%b %d, %Y %H:%M"),
-                            className="activity-list__title",
-                        ),
-                        html.Div(
-                            className="activity-list__meta",
-                            children=[
-                                html.Span(format_metric(record.get("distance_km"), " km", precision=1)),
-                                html.Span(format_metric(record.get("duration_min"), " min", precision=0)),
-                                html.Span(format_metric(record.get("speed_kmh"), " km/h", precision=1)),
-                            ],
-                        ),
-                        html.Div("Open detailed explanation", className="activity-list__hint"),
-                    ],
-                ),
-            ],
-        )
-        for record in activity_records
-    ]
+
+    # The list never changes while the app runs, so each page of cards is built once and
+    # reused by every later session; callers must not mutate the returned list.
+    @lru_cache(maxsize=32)
+    def build_activity_list_items(start: int, stop: int):
+        activity_rows = activity_table.iloc[start:stop][
+            ["activity_id", "start_label", "distance_label", "duration_label", "speed_label"]
+        ].itertuples(index=False, name=None)
+        return [
+            html.Div(
+                className="activity-list__item",
+                children=[
+                    html.A(
+                        href=f"/activity/{int(activity_id)}",
+                        className="activity-list__link",
+                        children=[
+                            html.Div(
+                                start_label,
+                                className="activity-list__title",
+                            ),
+                            html.Div(
+                                className="activity-list__meta",
+                                children=[
+                                    html.Span(distance_label),
+                                    html.Span(duration_label),
+                                    html.Span(speed_label),
+                                ],
+                            ),
+                            html.Div("Open detailed explanation", className="activity-list__hint"),
+                        ],
+                    ),
+                ],
+            )
+            for activity_id, start_label, distance_label, duration_label, speed_label in activity_rows
+        ]
 
     dash_app.layout = html.Div(
         className="app",
@@ -625,13 +846,18 @@ def create_dash_app(server: Flask) -> Dash:
                                             ),
                                             html.Span(f"{total_sessions:,} activities", className="data-details__hint"),
                                         ],
+                                        id="activity_list_summary",
                                         className="data-details__summary",
                                     ),
-                                    html.Div(
-                                        className="activity-list",
-                                        children=activity_list_items
-                                        if activity_list_items
-                                        else [html.Div("No activities available.", className="activity-list__empty")],
+                                    # Filled on first expand so the initial layout does not carry every activity card.
+                                    html.Div(id="activity_list", className="activity-list", children=[]),
+                                    dcc.Store(id="activity_list_count", data=0),
+                                    html.Button(
+                                        "Show more",
+                                        id="activity_list_more",
+                                        n_clicks=0,
+                                        hidden=True,
+                                        className="range-btn activity-list__more",
                                     ),
                                 ],
                             ),
@@ -658,7 +884,7 @@ def create_dash_app(server: Flask) -> Dash:
                                                             html.Button("12 months", id="1_year", n_clicks=0, className="range-btn"),
                                                         ],
                                                     ),
-                                                    html.Div("Last 7 days", id="range_label", className="card__pill"),
+                                                    html.Div(RANGE_LABELS["7D"], id="range_label", className="card__pill"),
                                                     html.Div(
                                                         className="zone-meta",
                                                         children=[
@@ -685,6 +911,7 @@ def create_dash_app(server: Flask) -> Dash:
                                         config={"displayModeBar": False, "responsive": True},
                                         style={"height": "100%", "minHeight": "360px"},
                                     ),
+                                    dcc.Store(id="range_period", data="7D"),
                                 ],
                             ),
                             html.Div(
@@ -716,6 +943,7 @@ def create_dash_app(server: Flask) -> Dash:
                                         config={"displayModeBar": False, "responsive": True},
                                         style={"height": "90%", "minHeight": "360px"},
                                     ),
+                                    dcc.Store(id="trend_window", data=90),
                                 ],
                             ),
                             html.Div(
@@ -749,76 +977,52 @@ def create_dash_app(server: Flask) -> Dash:
         ],
     )
 
-    @dash_app.callback(
-        Output("fig1", "figure"),
-        Output("range_label", "children"),
-        Output("1_week", "className"),
-        Output("1_month", "className"),
-        Output("1_year", "className"),
-        Input("1_week", "n_clicks"),
-        Input("1_month", "n_clicks"),
-        Input("1_year", "n_clicks"),
-    )
-    def update_range(_n_week, _n_month, _n_year):
-        trigger_id = get_triggered_input_id()
-
-        if trigger_id == "1_month":
-            period = "30D"
-            label = "Aggregated by 30 days"
-            active = "month"
-        elif trigger_id == "1_year":
-            period = "365D"
-            label = "Aggregated by 12 months"
-            active = "year"
-        else:
-            period = "7D"
-            label = "Aggregated by 7 days"
-            active = "week"
+    def zone_mix_patch(period: str):
+        fig1_patch = Patch()
+        fig1_patch["data"][0]["values"] = zone_mix_values[period]
+        return fig1_patch
 
-        fig1, _, _, _ = themed_figures(period)
+    def trend_window_patch(window_days: int):
+        trend_name, trend_values = efficiency_trend_line(window_days)
+        fig2_patch = Patch()
+        fig2_patch["data"][1]["name"] = trend_name
+        fig2_patch["data"][1]["y"] = trend_values
+        return fig2_patch
 
-        week_class = "range-btn active" if active == "week" else "range-btn"
-        month_class = "range-btn active" if active == "month" else "range-btn"
-        year_class = "range-btn active" if active == "year" else "range-btn"
+    register_range_toggle(
+        dash_app, RANGE_PERIODS, RANGE_LABELS, "range_label", "range_period", "fig1", zone_mix_patch
+    )
+    register_range_toggle(
+        dash_app, TREND_WINDOWS, TREND_LABELS, "trend_label", "trend_window", "fig2", trend_window_patch
+    )
 
-        return fig1, label, week_class, month_class, year_class
-    
     @dash_app.callback(
-        Output("fig2", "figure"),
-        Output("trend_label", "children"),
-        Output("trend_90", "className"),
-        Output("trend_180", "className"),
-        Output("trend_365", "className"),
-        Input("trend_90", "n_clicks"),
-        Input("trend_180", "n_clicks"),
-        Input("trend_365", "n_clicks"),
+        Output("activity_list", "children"),
+        Output("activity_list_count", "data"),
+        Output("activity_list_more", "hidden"),
+        Input("activity_list_summary", "n_clicks"),
+        Input("activity_list_more", "n_clicks"),
+        State("activity_list_count", "data"),
+        prevent_initial_call=True,
     )
-    def update_trend_window(_input_90, _input_180, _input_365):
-        trigger_id = get_triggered_input_id()
-
-        if trigger_id == "trend_365":
-            window_days = 365
-            label = "Rolling trend: 365 days"
-            active = "365"
-        elif trigger_id == "trend_180":
-            window_days = 180
-            label = "Rolling trend: 180 days"
-            active = "180"
-        else:
-            window_days = 90
-            label = "Rolling trend: 90 days"
-            active = "90"
-
-        # period only affects fig1, so we keep a fixed value while updating fig2.
-        _, fig2, _, _ = cleaner.return_figures(total_summary_with_ids, "7D", window_days)
-
-        fig2 = apply_theme(fig2)
-
-        class_90 = "range-btn active" if active == "90" else "range-btn"
-        class_180 = "range-btn active" if active == "180" else "range-btn"
-        class_365 = "range-btn active" if active == "365" else "range-btn"
-
-        return fig2, label, class_90, class_180, class_365
+    def render_activity_list(_n_summary, _n_more, shown):
+        shown = shown or 0
+        # The first expand renders one page; later toggles keep what is already there.
+        if shown and get_triggered_input_id() == "activity_list_summary":
+            return dash.no_update, dash.no_update, dash.no_update
+
+        stop = shown + ACTIVITY_LIST_PAGE_SIZE
+        activity_list_items = build_activity_list_items(shown, stop)
+        has_more = stop < len(activity_table)
+        if not shown:
+            if not activity_list_items:
+                return [html.Div("No activities available.", className="activity-list__empty")], 0, True
+            return activity_list_items, stop, not has_more
+
+        # Append the next page in the browser instead of resending the cards already shown.
+        activity_list_patch = Patch()
+        activity_list_patch.extend(activity_list_items)
+        return activity_list_patch, stop, not has_more
 
     @dash_app.callback(
         Output("activity_redirect", "pathname"),
@@ -838,4 +1042,11 @@ server = create_flask_server()
 dash_app = create_dash_app(server)
 
 if __name__ == "__main__":
-    server.run(host="127.0.0.1", port=5000, debug=True)
+    # Serve with waitress when it is installed so callbacks from several tabs run in its thread pool;
+    # otherwise fall back to the Werkzeug development server with the debugger.
+    try:
+        from waitress import serve
+    except ImportError:
+        server.run(host="127.0.0.1", port=5000, debug=True)
+    else:
+        serve(server, host="127.0.0.1", port=5000, threads=8)
@@ -10,8 +10,7 @@ from plot_card_common import ASSETS_DIR, apply_theme, load_dashboard_summary
 
 # This example renders a single static heatmap card.
 cleaner, total_summary = load_dashboard_summary()
-_, _, _, fig4 = cleaner.return_figures(total_summary, "7D")
-fig4 = apply_theme(fig4)
+fig4 = apply_theme(cleaner.heatmap_figure(total_summary))
 
 app = Dash(
     __name__,
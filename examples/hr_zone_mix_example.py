@@ -4,19 +4,24 @@ Run:
     python examples/hr_zone_mix_example.py
 """
 
-import dash
-from dash import Dash, Input, Output, dcc, html
+from functools import lru_cache
 
-from plot_card_common import ASSETS_DIR, apply_theme, load_dashboard_summary
+from dash import Dash, dcc, html
+
+from plot_card_common import ASSETS_DIR, apply_theme, load_dashboard_summary, register_range_toggle
 
 # Load once at startup; callbacks only swap chart aggregation windows.
 cleaner, total_summary = load_dashboard_summary()
 
+# Period buttons: button id -> period, and the pill label per period.
+ZONE_PERIODS = {"zone_week": "7D", "zone_month": "30D", "zone_year": "365D"}
+ZONE_LABELS = {"7D": "Aggregated by 7 days", "30D": "Aggregated by 30 days", "365D": "Aggregated by 12 months"}
+
 
+@lru_cache(maxsize=4)
 def build_zone_mix_figure(period: str):
-    """Build only figure 1 (zone mix pie) for the selected period."""
-    fig1, _, _, _ = cleaner.return_figures(total_summary, period)
-    return apply_theme(fig1)
+    """Build only figure 1 (zone mix pie), once per selectable period."""
+    return apply_theme(cleaner.zone_mix_figure(total_summary, period))
 
 
 app = Dash(
@@ -69,6 +74,7 @@ app.layout = html.Div(
                                 ),
                             ],
                         ),
+                        dcc.Store(id="zone_period", data="7D"),
                         dcc.Graph(
                             id="zone_fig",
                             figure=build_zone_mix_figure("7D"),
@@ -84,38 +90,9 @@ app.layout = html.Div(
 
 
 # Update the zone mix period and keep button active states in sync.
-@app.callback(
-    Output("zone_fig", "figure"),
-    Output("zone_range_label", "children"),
-    Output("zone_week", "className"),
-    Output("zone_month", "className"),
-    Output("zone_year", "className"),
-    Input("zone_week", "n_clicks"),
-    Input("zone_month", "n_clicks"),
-    Input("zone_year", "n_clicks"),
+register_range_toggle(
+    app, ZONE_PERIODS, ZONE_LABELS, "zone_range_label", "zone_period", "zone_fig", build_zone_mix_figure
 )
-def update_zone_mix(_n_week, _n_month, _n_year):
-    triggered = dash.callback_context.triggered
-    trigger_id = triggered[0]["prop_id"].split(".")[0] if triggered else ""
-
-    if trigger_id == "zone_month":
-        period = "30D"
-        label = "Aggregated by 30 days"
-        active = "month"
-    elif trigger_id == "zone_year":
-        period = "365D"
-        label = "Aggregated by 12 months"
-        active = "year"
-    else:
-        period = "7D"
-        label = "Aggregated by 7 days"
-        active = "week"
-
-    week_class = "range-btn active" if active == "week" else "range-btn"
-    month_class = "range-btn active" if active == "month" else "range-btn"
-    year_class = "range-btn active" if active == "year" else "range-btn"
-
-    return build_zone_mix_figure(period), label, week_class, month_class, year_class
 
 
 if __name__ == "__main__":
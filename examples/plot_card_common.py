@@ -1,87 +1,302 @@
-"""Shared helpers for standalone dashboard card examples.
+"""Shared helpers for the full dashboard and the standalone dashboard card examples.
 
 This module centralizes:
 - project path resolution for running scripts from `examples/`
 - dashboard data loading from `data/`
-- common Plotly styling used by all card examples
+- common Plotly styling (a registered template) used by all card examples
+- the option-button toggle callback shared by the interactive cards
+- the on-disk caches of the fitted context model and compiled page templates
 """
 
+import hashlib
+import json
 import logging
 import os
+import pickle
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import partial
 
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR))
 ASSETS_DIR = os.path.join(PROJECT_ROOT, "..", "assets")
 DATA_DIR = os.path.join(PROJECT_ROOT, "data")
+SUMMARY_CACHE_DIR = ".cache"
+# Hashed into every cache key. Bump it whenever build_dashboard or a cached payload changes, so files
+# written by older code are rebuilt instead of silently reused.
+CACHE_VERSION = 1
+TEMPLATE_CACHE_DIR = os.path.join(DATA_DIR, SUMMARY_CACHE_DIR, "jinja")
 
 if PROJECT_ROOT not in sys.path:
     # Let example scripts import `pace_view` without installing the package first.
     sys.path.insert(0, PROJECT_ROOT)
 
-from pace_view.data_cleaning import DataCleaner
-from pace_view.data_parsing import DataParser
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
 
 LOGGER = logging.getLogger(__name__)
+THEME_TEMPLATE = "paceview"
+THEME_MARGIN = dict(l=40, r=28, t=56, b=40)
+# Complete apply_theme update arguments, built once so themed figures share them instead of rebuilding literals.
+THEME_LAYOUT = dict(template=THEME_TEMPLATE, margin=THEME_MARGIN)
+THEME_TRACE_LAYOUTS = {
+    "pie": dict(THEME_LAYOUT, showlegend=False),
+    "heatmap": dict(
+        THEME_LAYOUT,
+        coloraxis_colorscale=[[0, "#e2e8f0"], [0.5, "#94a3b8"], [1, "#0f172a"]],
+        coloraxis_colorbar=dict(title="Avg HR"),
+    ),
+}
+THEME_TRACE_STYLES = {
+    "pie": dict(selector=dict(type="pie"), domain=dict(x=[0.15, 0.85], y=[0.1, 0.9])),
+}
 
+# Register the dashboard look once; figures then only reference the template by name.
+_theme = go.layout.Template(pio.templates["plotly_white"])
+_theme.layout.update(
+    paper_bgcolor="rgba(0,0,0,0)",
+    plot_bgcolor="rgba(0,0,0,0)",
+    font=dict(family="DM Sans", color="#0f172a"),
+    title=dict(font=dict(family="Space Grotesk", size=18), x=0.02, xanchor="left"),
+    margin=THEME_MARGIN,
+    colorway=["#0f172a", "#334155", "#64748b", "#94a3b8", "#0ea5a4"],
+    hoverlabel=dict(bgcolor="#0f172a", font=dict(color="#ffffff", family="DM Sans")),
+    xaxis=dict(showgrid=True, gridcolor="rgba(15, 23, 42, 0.08)", zeroline=False),
+    yaxis=dict(showgrid=True, gridcolor="rgba(15, 23, 42, 0.08)", zeroline=False),
+)
+_theme.data.scatter = [go.Scatter(marker=dict(size=7, opacity=0.8, line=dict(width=0)), line=dict(width=3))]
+_theme.data.pie = [go.Pie(hole=0.5, textinfo="percent+label", marker=dict(line=dict(color="#ffffff", width=1)))]
+pio.templates[THEME_TEMPLATE] = _theme
 
-def load_exercises_with_filenames(parser: DataParser, directory_name: str):
-    """Load readable TCX files and keep `(source_file, exercise)` tuples."""
-    file_names = sorted([f for f in os.listdir(directory_name) if f.lower().endswith(".tcx")])
-    exercises = []
+
+def list_tcx_files(directory_name: str) -> list[str]:
+    """Sorted names of the `.tcx` files directly inside `directory_name`."""
+    # DirEntry carries the file type from the directory read, so filtering needs no extra stat.
+    with os.scandir(directory_name) as entries:
+        return sorted(entry.name for entry in entries if entry.name.lower().endswith(".tcx") and entry.is_file())
+
+
+def summary_cache_key(directory_name: str, file_names: list[str]) -> str:
+    """Hash the cache version plus TCX names, mtimes and sizes so any change in the data folder yields a new key."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"v{CACHE_VERSION};".encode())
     for file_name in file_names:
-        file_path = os.path.join(directory_name, file_name)
+        stat = os.stat(os.path.join(directory_name, file_name))
+        digest.update(f"{file_name}:{stat.st_mtime_ns}:{stat.st_size};".encode())
+    return digest.hexdigest()
+
+
+def prune_cache_files(cache_dir: str, cache_key: str, suffixes: tuple[str, ...]) -> None:
+    """Delete `<key><suffix>` files in `cache_dir` that were written under any key other than `cache_key`."""
+    with os.scandir(cache_dir) as entries:
+        stale = []
+        for entry in entries:
+            key, _, suffix = entry.name.partition(".")
+            if f".{suffix}" in suffixes and key != cache_key and len(key) == 32:
+                stale.append(entry.path)
+    for path in stale:
         try:
-            exercise = parser.parse_tcx_file(file_path)
-            if exercise is not None:
-                exercises.append((file_name, exercise))
-        except Exception as exc:
-            LOGGER.warning("Skipping unreadable file %s: %s", file_name, exc)
+            os.remove(path)
+        except OSError as exc:
+            LOGGER.warning("Could not remove stale cache file %s: %s", path, exc)
+
+
+def context_cache_path(history_folder: str, estimator) -> str:
+    """Pickle path for the fitted context model of `history_folder`.
+
+    The key covers the TCX files (via `summary_cache_key`) and the estimator's class and scikit-learn version,
+    so a model pickled by another estimator or library release is never loaded in place of a fresh fit.
+    """
+    import sklearn
+
+    estimator_type = type(estimator)
+    file_key = summary_cache_key(history_folder, list_tcx_files(history_folder))
+    model_token = f"{estimator_type.__module__}.{estimator_type.__qualname__}:{sklearn.__version__}"
+    cache_key = hashlib.blake2b(f"{file_key}:{model_token}".encode(), digest_size=16).hexdigest()
+    return os.path.join(history_folder, SUMMARY_CACHE_DIR, f"{cache_key}.context.pkl")
+
+
+def load_context_cache(cache_path: str):
+    """Unpickle a cached context payload, or return None when it is missing or unreadable."""
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with open(cache_path, "rb") as handle:
+            return pickle.load(handle)
+    except Exception as exc:
+        LOGGER.warning("Ignoring unreadable context cache %s: %s", cache_path, exc)
+        return None
+
+
+def save_context_cache(cache_path: str, payload: dict) -> None:
+    """Pickle a context payload and delete the ones stored under older keys."""
+    cache_dir = os.path.dirname(cache_path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_path, "wb") as handle:
+            pickle.dump(payload, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        prune_cache_files(cache_dir, os.path.basename(cache_path).partition(".")[0], (".context.pkl",))
+    except OSError as exc:
+        LOGGER.warning("Could not write context cache %s: %s", cache_path, exc)
+
+
+def template_bytecode_cache():
+    """Jinja bytecode cache kept in `data/.cache/jinja` instead of the shared system temp dir."""
+    from jinja2 import FileSystemBytecodeCache
+
+    os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+    return FileSystemBytecodeCache(TEMPLATE_CACHE_DIR)
+
+
+def load_exercises_with_filenames(
+    parser: "DataParser", directory_name: str, file_names: list[str] | None = None, workers: int = 1
+):
+    """Load readable TCX files and keep `(source_file, exercise)` tuples; workers > 1 parse in a process pool."""
+    if file_names is None:
+        file_names = list_tcx_files(directory_name)
+    file_paths = [os.path.join(directory_name, file_name) for file_name in file_names]
+    with ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as pool:
+        if pool is None:
+            jobs = [partial(parser.parse_tcx_columns, file_path) for file_path in file_paths]
+        else:
+            from pace_view.data_parsing import _read_tcx, read_tcx_columns
+
+            # Submit everything up front; results are still collected in file order. Each task pickles the
+            # module-level reader, the path and the cache handle rather than the whole DataParser.
+            jobs = [
+                pool.submit(_read_tcx, read_tcx_columns, file_path, parser.tcx_cache).result for file_path in file_paths
+            ]
+        exercises = []
+        for file_name, job in zip(file_names, jobs):
+            try:
+                exercise = job()
+                if exercise is not None:
+                    exercises.append((file_name, exercise))
+            except Exception as exc:
+                LOGGER.warning("Skipping unreadable file %s: %s", file_name, exc)
     return exercises
 
 
 def load_dashboard_summary():
-    """Return the shared cleaner instance and prepared dashboard summary dataframe."""
-    parser = DataParser()
+    """Return the shared cleaner instance and prepared dashboard summary dataframe.
+
+    The summary is pickled under `data/.cache`, keyed by `CACHE_VERSION` and the TCX files' names, mtimes and sizes,
+    so later launches skip TCX parsing until the data folder changes; then only changed files are parsed again.
+    Summaries written under an older key are deleted once the new one is stored.
+    """
+    # Imported here so `apply_theme`-only users do not pay for pandas and the TCX parser stack.
+    import pandas as pd
+
+    from pace_view.data_cleaning import DataCleaner
+    from pace_view.data_parsing import DataParser
+
     cleaner = DataCleaner()
-    exercises = load_exercises_with_filenames(parser, DATA_DIR)
+    file_names = list_tcx_files(DATA_DIR)
+    cache_dir = os.path.join(DATA_DIR, SUMMARY_CACHE_DIR)
+    # Own suffix: full_dashboard.py stores a compacted frame under the same key.
+    cache_key = summary_cache_key(DATA_DIR, file_names)
+    summary_path = os.path.join(cache_dir, f"{cache_key}.cards.pkl")
+
+    if os.path.exists(summary_path):
+        try:
+            return cleaner, pd.read_pickle(summary_path)
+        except Exception as exc:
+            LOGGER.warning("Ignoring unreadable summary cache %s: %s", summary_path, exc)
+
+    parser = DataParser(cache_dir=os.path.join(cache_dir, "tcx"))
+    # Parsed in this process: the card examples call this at import time, where a "spawn" pool (macOS, Windows)
+    # cannot bootstrap its workers from the half-imported main module.
+    exercises = load_exercises_with_filenames(parser, DATA_DIR, file_names)
     total_summary = cleaner.build_dashboard(exercises)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        total_summary.to_pickle(summary_path)
+        prune_cache_files(cache_dir, cache_key, (".cards.pkl",))
+    except OSError as exc:
+        LOGGER.warning("Could not write summary cache in %s: %s", cache_dir, exc)
     return cleaner, total_summary
 
 
+def float32_values(values):
+    """Return float64 plot data as float32; anything else is returned unchanged.
+
+    Plotted values never need double precision, and float32 halves the base64 payload per number. Figures go
+    through `apply_theme`; use this directly on arrays sent in `Patch` updates.
+    """
+    if values is None or isinstance(values, str):
+        return values
+    array = np.asarray(values)
+    return array.astype(np.float32) if array.dtype == np.float64 else values
+
+
 def apply_theme(fig):
-    """Apply the same visual theme used by the main dashboard."""
-    fig.update_layout(
-        template="plotly_white",
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        font=dict(family="DM Sans", color="#0f172a"),
-        title=dict(font=dict(family="Space Grotesk", size=18), x=0.02, xanchor="left"),
-        margin=dict(l=40, r=28, t=56, b=40),
-        colorway=["#0f172a", "#334155", "#64748b", "#94a3b8", "#0ea5a4"],
-        hoverlabel=dict(bgcolor="#0f172a", font=dict(color="#ffffff", family="DM Sans")),
-    )
-    fig.update_xaxes(showgrid=True, gridcolor="rgba(15, 23, 42, 0.08)", zeroline=False)
-    fig.update_yaxes(showgrid=True, gridcolor="rgba(15, 23, 42, 0.08)", zeroline=False)
-    fig.update_traces(marker=dict(line=dict(width=0)), selector=dict(type="scatter"))
-
-    if fig.data:
-        fig_type = fig.data[0].type
-        if fig_type == "pie":
-            fig.update_traces(
-                hole=0.5,
-                textinfo="percent+label",
-                marker=dict(line=dict(color="#ffffff", width=1)),
-                domain=dict(x=[0.15, 0.85], y=[0.1, 0.9]),
-                selector=dict(type="pie"),
-            )
-            fig.update_layout(showlegend=False)
-        if fig_type == "heatmap":
-            fig.update_layout(
-                coloraxis_colorscale=[[0, "#e2e8f0"], [0.5, "#94a3b8"], [1, "#0f172a"]],
-                coloraxis_colorbar=dict(title="Avg HR"),
-            )
-
-    fig.update_traces(marker=dict(size=7, opacity=0.8), selector=dict(mode="markers"))
-    fig.update_traces(line=dict(width=3), selector=dict(mode="lines"))
+    """Attach the dashboard template plus the tweaks Plotly Express sets explicitly per figure."""
+    fig_type = fig.data[0].type if fig.data else None
+    fig.update_layout(THEME_TRACE_LAYOUTS.get(fig_type, THEME_LAYOUT))
+
+    for trace in fig.data:
+        for attr in ("x", "y", "z"):
+            if attr in trace and trace[attr] is not None:
+                trace[attr] = float32_values(trace[attr])
+
+    if fig_type in THEME_TRACE_STYLES:
+        fig.update_traces(**THEME_TRACE_STYLES[fig_type])
     return fig
+
+
+def button_toggle_clientside(toggle_states: dict) -> str:
+    """JS clientside callback returning the precomputed label and button classes of the clicked button."""
+    return (
+        "function () {"
+        f" const states = {json.dumps(toggle_states)};"
+        " const triggered = dash_clientside.callback_context.triggered;"
+        " const state = triggered.length ? states[triggered[0].prop_id.split('.')[0]] : undefined;"
+        " if (state === undefined) { throw dash_clientside.PreventUpdate; }"
+        " return state;"
+        " }"
+    )
+
+
+def register_range_toggle(app, button_values: dict, labels: dict, label_id: str, store_id: str, graph_id: str, figure_fn):
+    """Wire a row of option buttons to one graph.
+
+    `button_values` maps button id -> option value and `labels` maps option value -> pill text. The pill and the
+    active-button classes switch clientside; the server only sends `figure_fn(value)` for `graph_id` and
+    remembers the active value in the `store_id` store, so clicks on the active button are ignored.
+    """
+    import dash
+    from dash import Input, Output, State
+
+    # Button id -> [pill label, *button classes], applied in the browser without a server round-trip.
+    toggle_states = {
+        button_id: [
+            labels[value],
+            *("range-btn active" if other == button_id else "range-btn" for other in button_values),
+        ]
+        for button_id, value in button_values.items()
+    }
+    button_inputs = [Input(button_id, "n_clicks") for button_id in button_values]
+
+    app.clientside_callback(
+        button_toggle_clientside(toggle_states),
+        Output(label_id, "children"),
+        *(Output(button_id, "className") for button_id in button_values),
+        *button_inputs,
+        prevent_initial_call=True,
+    )
+
+    @app.callback(
+        Output(graph_id, "figure"),
+        Output(store_id, "data"),
+        *button_inputs,
+        State(store_id, "data"),
+        prevent_initial_call=True,
+    )
+    def update_graph(*args):
+        value = button_values.get(dash.ctx.triggered_id or "")
+        # Clicking the active button changes nothing, so skip the patch and the client re-render.
+        if value is None or value == args[-1]:
+            return dash.no_update, dash.no_update
+        return figure_fn(value), value
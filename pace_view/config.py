@@ -1,11 +1,15 @@
 """Configuration helpers for environment-based settings."""
 
 import os
+import re
+from functools import lru_cache
 from pathlib import Path
 
 WEATHER_API_KEY_ENV = "WEATHER_API_KEY"
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 DEFAULT_ENV_PATH = PROJECT_ROOT / ".env"
+# `KEY=value` with an optional `export ` prefix; the line is already stripped.
+_ENV_LINE = re.compile(r"^(?:export )?\s*([^=]*?)\s*=\s*(.*)$")
 
 
 def _load_env_fallback(env_path: Path):
@@ -17,14 +21,11 @@ def _load_env_fallback(env_path: Path):
         line = raw_line.strip()
         if not line or line.startswith("#"):
             continue
-        if line.startswith("export "):
-            line = line[len("export "):].strip()
-        if "=" not in line:
+        match = _ENV_LINE.match(line)
+        if match is None:
             continue
 
-        key, value = line.split("=", 1)
-        key = key.strip()
-        value = value.strip()
+        key, value = match.groups()
         if not key:
             continue
 
@@ -34,19 +35,24 @@ def _load_env_fallback(env_path: Path):
         os.environ.setdefault(key, value)
 
 
-def load_project_env(env_path: str | None = None):
-    """Load project `.env` into process environment without overriding existing vars."""
-    env_file = Path(env_path) if env_path else DEFAULT_ENV_PATH
-
+@lru_cache(maxsize=None)
+def _load_env_file(env_file: str):
+    """Load one `.env` file; memoized per resolved path, since existing vars are never overridden anyway."""
     try:
         from dotenv import load_dotenv  # type: ignore
     except Exception:
-        _load_env_fallback(env_file)
+        _load_env_fallback(Path(env_file))
         return
 
     load_dotenv(dotenv_path=env_file, override=False)
 
 
+def load_project_env(env_path: str | None = None):
+    """Load project `.env` into process environment without overriding existing vars."""
+    env_file = Path(env_path) if env_path else DEFAULT_ENV_PATH
+    _load_env_file(str(env_file.resolve()))
+
+
 def get_weather_api_key(env_path: str | None = None) -> str | None:
     """Resolve weather API key from environment / optional project `.env`."""
     load_project_env(env_path=env_path)
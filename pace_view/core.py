@@ -3,6 +3,9 @@ Orchestrates the end-to-end contextual intelligence flow for cycling data from T
 """
 
 import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import partial
 import pandas as pd
 from .data_parsing import DataParser
 from .data_cleaning import DataCleaner
@@ -13,6 +16,14 @@ from .rationale import RationaleGenerator
 from .mining import PatternMiner
 
 
+def _process_history_file(filepath, time_delta=1):
+    """
+    Worker entry point for parallel fit(); each process builds its own pipeline objects.
+    """
+    trainer = ContextTrainer(os.path.dirname(filepath), time_delta=time_delta)
+    return trainer._process_file(filepath, is_training=True)
+
+
 class ContextTrainer:
     """
     High-level API that ties parsing, physics, digital twin, and XAI together.
@@ -40,26 +51,34 @@ class ContextTrainer:
 
         return self.engine.calculate_virtual_power(df)
 
-    def fit(self):
+    def fit(self, workers=1):
         """
         Train the Digital Twin model on all historical TCX files. This reflects component 2 of the architecture for environmental quantification.
+        With workers > 1 the files are parsed in a process pool; results keep the directory order.
         """
         print(f"Loading history from {self.history_folder}...")
         files = [f for f in os.listdir(self.history_folder) if f.endswith('.tcx')]
+        paths = [os.path.join(self.history_folder, f) for f in files]
         dfs = []
-        for i, f in enumerate(files):
-            try:
-                path = os.path.join(self.history_folder, f)
-                df = self._process_file(path, is_training=True)
-                if df is not None and len(df) > 0:
-                    dfs.append(df)
-                if i % 10 == 0: print(f"  Processed {i}/{len(files)} activities...")
-            except: pass 
+        with ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as pool:
+            if pool is None:
+                jobs = [partial(self._process_file, path, is_training=True) for path in paths]
+            else:
+                jobs = [pool.submit(_process_history_file, path, self.parser.time_delta).result for path in paths]
+            for i, job in enumerate(jobs):
+                try:
+                    df = job()
+                    if df is not None and len(df) > 0:
+                        dfs.append(df)
+                    if i % 10 == 0: print(f"  Processed {i}/{len(files)} activities...")
+                except: pass 
 
         if not dfs: raise Exception("No valid TCX files found.")
 
         print("Training Physiological Model...")
         full_history = pd.concat(dfs, ignore_index=True)
+        # Only full_history is used from here on; release the per-file frames before training.
+        dfs.clear()
         score = self.model.train(full_history)
         print(f"Model Trained! Accuracy (R2): {score:.2f}")
         
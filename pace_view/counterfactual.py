@@ -23,14 +23,14 @@ class CounterfactualAnalyzer:
         df_new = df_new.copy()
 
         # 1. Predict HR under actual conditions
-        X_actual = df_new[self.model.features].fillna(0)
+        X_actual = self.model.feature_matrix(df_new)
         hr_actual_pred = self.model.model.predict(X_actual)
 
         # 2. Predict HR under standard conditions -> counterfactual
         X_standard = X_actual.copy()
         for key, value in self.standard_env.items():
-            if key in X_standard.columns:
-                X_standard[key] = value
+            if key in self.model.features:
+                X_standard[:, self.model.features.index(key)] = value
 
         hr_standard_pred = self.model.model.predict(X_standard)
 
@@ -2,10 +2,19 @@
 Cleaning and alignment logic for parsed activity and weather data.
 """
 
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from operator import attrgetter
 import numpy as np
 import pandas as pd
-import plotly.express as plotlyy
+from .data_parsing import TCXTrackColumns, value_getter
+
+try:
+    # Optional compiled downsampler; the NumPy LTTB below is used when it is not installed.
+    from tsdownsample import MinMaxLTTBDownsampler
+except ImportError:
+    MinMaxLTTBDownsampler = None
 
 
 @dataclass
@@ -15,6 +24,120 @@ class AthleteConfig:
     h_r_r_bound = (0.5, 0.6, 0.7, 0.8, 0.9, 1.1)
     coefficient = (1, 2, 3, 4, 5)
     b: float = 1.92
+    # Derived once per config for the zone and TRIMP helpers.
+    _hrr_denom: float = field(init=False, repr=False, compare=False)
+    _bounds_arr: np.ndarray = field(init=False, repr=False, compare=False)
+    _coef_arr: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._hrr_denom = self.h_r_max - self.h_r_rest
+        self._bounds_arr = np.asarray(self.h_r_r_bound, dtype=np.float64)
+        self._coef_arr = np.asarray(self.coefficient, dtype=np.float64)
+
+
+def _nanmean(values: np.ndarray) -> float:
+    """
+    Mean of the non-NaN entries, or NaN when there are none (without numpy's empty-slice warning).
+    """
+    valid = values[~np.isnan(values)]
+    return float(valid.mean()) if valid.size else np.nan
+
+
+def _numeric_column(values) -> np.ndarray:
+    """
+    Parse a raw text column like pd.to_numeric(errors="coerce"): all-integer text stays int64,
+    otherwise float64 with missing (None) or malformed entries as NaN.
+    """
+    for dtype in (np.int64, np.float64):
+        try:
+            # NumPy parses plain numeric text in one C call and stops at the first entry that does not fit.
+            return np.array(values, dtype=dtype)
+        except (TypeError, ValueError, OverflowError):
+            continue
+    return pd.to_numeric(values, errors="coerce")
+
+
+def _typed_column(values):
+    """
+    Array of already-numeric values with the dtype pandas would infer: int64 or float64, None as NaN.
+    Anything else (e.g. text) is returned unchanged for pandas to infer and the caller to coerce.
+    """
+    column = np.array(values)
+    if column.dtype.kind in "iuf":
+        return column
+    if column.dtype == object:
+        try:
+            return np.array(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            pass
+    return values
+
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Pick `n_out` visually representative points with Largest-Triangle-Three-Buckets.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    if MinMaxLTTBDownsampler is not None:
+        return MinMaxLTTBDownsampler().downsample(x, y, n_out=n_out).astype(int)
+
+    # First and last points are always kept; the rest is split into n_out - 2 buckets.
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    indices = np.empty(n_out, dtype=int)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    prev = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs(
+            (x[prev] - avg_x) * (y[start:end] - y[prev]) - (x[prev] - x[start:end]) * (avg_y - y[prev])
+        )
+        prev = start + int(np.argmax(area))
+        indices[i + 1] = prev
+    return indices
+
+
+def _rolling_linear_trend(
+    dates: np.ndarray, x: np.ndarray, y: np.ndarray, window_days, min_points=2
+) -> np.ndarray:
+    """
+    Least-squares line over each trailing `window_days` window of sorted `dates`, evaluated at that point.
+    Window sums come from prefix sums, so every point costs O(1) instead of a polyfit over a boolean mask.
+    """
+    start = np.searchsorted(dates, dates - np.timedelta64(window_days, "D"), side="left")
+    stop = np.searchsorted(dates, dates, side="right")
+    count = stop - start
+
+    # Shift x to start at zero so the squared prefix sums stay small and their differences precise.
+    x = x - x[0] if len(x) else x
+    sums = [np.concatenate(([0.0], np.cumsum(values))) for values in (x, y, x * x, x * y)]
+    sum_x, sum_y, sum_xx, sum_xy = (total[stop] - total[start] for total in sums)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        denom = count * sum_xx - sum_x * sum_x
+        slope = (count * sum_xy - sum_x * sum_y) / denom
+        intercept = (sum_y - slope * sum_x) / count
+        trend = slope * x + intercept
+        # All x equal in the window: polyfit's least-squares fit is then the mean of y.
+        flat = denom <= 1e-12 * count * sum_xx
+        trend[flat] = sum_y[flat] / count[flat]
+    trend[count < min_points] = np.nan
+    return trend
+
+
+# Accepted keys per weather column: neutral-weather dicts use the short names, weather objects the long ones.
+WEATHER_KEYS = (
+    ("temp", "temperature"),
+    ("hum", "humidity"),
+    ("wspd", "wind_speed"),
+    ("wdir", "wind_direction"),
+)
 
 
 class DataCleaner:
@@ -30,33 +153,43 @@ class DataCleaner:
         """
         if self.parser is None:
             raise ValueError("DataCleaner requires a DataParser instance for weather-aligned dataframes.")
-        temps = [self.parser._get_val(w, ["temp", "temperature"]) for w in weather_data]
-        hums = [self.parser._get_val(w, ["hum", "humidity"]) for w in weather_data]
-        winds = [self.parser._get_val(w, ["wspd", "wind_speed"]) for w in weather_data]
-        bearings = [self.parser._get_val(w, ["wdir", "wind_direction"]) for w in weather_data]
-
         hr_numeric = pd.to_numeric(act["heartrates"], errors="coerce")
         speed_numeric = pd.to_numeric(act["speeds"], errors="coerce")
         min_len = min(len(act["timestamps"]), len(hr_numeric))
 
+        temps, hums, winds, bearings = self._weather_columns(weather_data[:min_len])
+        positions = np.asarray(act["positions"], dtype=float).reshape(-1, 2)[:min_len]
+
         df = pd.DataFrame(
             {
                 "time": act["timestamps"][:min_len],
-                "lat": [p[0] for p in act["positions"]][:min_len],
-                "lon": [p[1] for p in act["positions"]][:min_len],
+                "lat": positions[:, 0],
+                "lon": positions[:, 1],
                 "ele": act["altitudes"][:min_len],
                 "dist": act["distances"][:min_len],
                 "hr": hr_numeric[:min_len],
                 "speed_mps": speed_numeric[:min_len] / 3.6,
-                "temp": temps[:min_len],
-                "wind_speed_mps": np.array(winds[:min_len]) / 3.6,
-                "wind_dir": bearings[:min_len],
-                "hum": hums[:min_len],
+                "temp": temps,
+                "wind_speed_mps": np.asarray(winds) / 3.6,
+                "wind_dir": bearings,
+                "hum": hums,
             }
         )
 
         return df
 
+    def _weather_columns(self, weather_data):
+        """
+        Split weather samples into temperature, humidity, wind speed and wind direction columns.
+        """
+        if len(weather_data) == 0:
+            return [], [], [], []
+        first = weather_data[0]
+        # The neutral-weather fallback repeats a single dict; read it once and broadcast.
+        if all(w is first for w in weather_data):
+            return tuple(np.full(len(weather_data), value_getter(keys)(first)) for keys in WEATHER_KEYS)
+        return tuple(list(map(value_getter(keys), weather_data)) for keys in WEATHER_KEYS)
+
     def get_calory_average(self, exercises):
         """
         Calculate average calories across exercises.
@@ -80,7 +213,10 @@ class DataCleaner:
             "distance",
             "altitude_avg",
         ]
-        df = pd.DataFrame([{f: getattr(e, f) for f in columns} for (_, e) in exercises])
+        # attrgetter fetches each exercise's fields in one call; zip(*rows) transposes them into columns.
+        get_fields = attrgetter(*columns)
+        rows = [get_fields(e) for (_, e) in exercises]
+        df = pd.DataFrame(dict(zip(columns, zip(*rows))))
         return df
 
     def get_exercise_dataframe(self, exercises):
@@ -96,71 +232,122 @@ class DataCleaner:
         df["iso_year_week"] = iso["year"].astype(str) + "" + iso["week"].astype(str).str.zfill(2)
         return df
 
+    def _track_columns_frame(self, columns: TCXTrackColumns) -> pd.DataFrame:
+        """
+        Convert the raw text columns of `read_tcx_columns` with one vectorized call per column.
+        """
+        df = pd.DataFrame(
+            {
+                "time": pd.to_datetime(columns.time, utc=True, errors="coerce", format="ISO8601").as_unit("us"),
+                # tcxreader truncates heart rate to an int.
+                "h_r": np.trunc(_numeric_column(columns.h_r)),
+                "dist_m": _numeric_column(columns.dist_m),
+                "alt_m": _numeric_column(columns.alt_m),
+                "lat": _numeric_column(columns.lat),
+                "lon": _numeric_column(columns.lon),
+            }
+        )
+        # Like tcxreader's only_gps reading, trackpoints without a longitude are dropped.
+        return df[df["lon"].notna()]
+
     def exercise_timeframes(self, exercise):
         """
-        Convert a tcxreader exercise into a clean time-series dataframe.
-        """
-        rows = []
-        if exercise.trackpoints:
-            for tp in exercise.trackpoints:
-                rows.append(
-                    {
-                        "time": pd.to_datetime(tp.time, utc=True, errors="coerce"),
-                        "h_r": tp.hr_value,
-                        "dist_m": tp.distance,
-                        "alt_m": tp.elevation,
-                        "lat": tp.latitude,
-                        "lon": tp.longitude,
-                    }
-                )
+        Convert a tcxreader exercise (or TCXTrackColumns) into a clean time-series dataframe.
+        """
+        if isinstance(exercise, TCXTrackColumns):
+            df = self._track_columns_frame(exercise)
+            if df.empty:
+                return None
+        elif exercise.trackpoints:
+            trackpoints = exercise.trackpoints
+            # One list per column instead of a dict per trackpoint, handed to pandas as typed arrays.
+            df = pd.DataFrame(
+                {
+                    "time": pd.to_datetime([tp.time for tp in trackpoints], utc=True, errors="coerce"),
+                    "h_r": _typed_column([tp.hr_value for tp in trackpoints]),
+                    "dist_m": _typed_column([tp.distance for tp in trackpoints]),
+                    "alt_m": _typed_column([tp.elevation for tp in trackpoints]),
+                    "lat": _typed_column([tp.latitude for tp in trackpoints]),
+                    "lon": _typed_column([tp.longitude for tp in trackpoints]),
+                }
+            )
+        else:
+            return None
+
+        df = df.dropna(subset=["time"]).sort_values("time").drop_duplicates("time")
+        for c in ["h_r", "dist_m", "alt_m", "lat", "lon"]:
+            if df[c].dtype == object:
+                df[c] = pd.to_numeric(df[c], errors="coerce")
+
+        # Differences on the raw arrays skip the Series.diff / .dt accessor overhead.
+        times = df["time"].to_numpy(dtype="datetime64[ns]")
+        dt_s = np.full(len(df), np.nan)
+        dt_s[1:] = np.diff(times) / np.timedelta64(1, "s")
+        np.clip(dt_s, 0, None, out=dt_s)
+        speed_mps = np.full(len(df), np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            speed_mps[1:] = np.diff(df["dist_m"].to_numpy(dtype=float)) / np.where(dt_s[1:] == 0, np.nan, dt_s[1:])
+        df["dt_s"] = dt_s
+        df["speed_mps"] = speed_mps
+        return df.reset_index(drop=True)
 
-            df = pd.DataFrame(rows).dropna(subset=["time"]).sort_values("time").drop_duplicates("time")
-            for c in ["h_r", "dist_m", "alt_m", "lat", "lon"]:
-                if c in df.columns:
-                    df[c] = pd.to_numeric(df[c], errors="coerce")
+    def hrr_intensity(self, h_r: pd.Series, config: AthleteConfig) -> pd.Series:
+        return (h_r - config.h_r_rest) / config._hrr_denom
 
-            df["dt_s"] = df["time"].diff().dt.total_seconds().clip(lower=0)
-            df["speed_mps"] = df["dist_m"].diff() / df["dt_s"].replace(0, np.nan)
-            return df.reset_index(drop=True)
-        return None
+    def _clipped_hrr(self, h_r: np.ndarray, config: AthleteConfig) -> np.ndarray:
+        return np.clip((h_r - config.h_r_rest) / config._hrr_denom, 0.0, 1.2)
 
-    def hrr_intensity(self, h_r: pd.Series, config: AthleteConfig) -> pd.Series:
-        return (h_r - config.h_r_rest) / (config.h_r_max - config.h_r_rest)
+    def _zone_indices(self, hrr: np.ndarray, config: AthleteConfig) -> np.ndarray:
+        """
+        HRR zone (1-5) of each clipped intensity; missing HR falls into zone 5, as with np.digitize.
+        """
+        # Same bins as np.digitize(x, bounds, right=True), via a plain binary search.
+        return np.searchsorted(config._bounds_arr, hrr, side="left").clip(1, 5)
+
+    def _zone_seconds(self, zones: np.ndarray, dt: np.ndarray) -> np.ndarray:
+        # Indexed by zone number; slot 0 stays empty.
+        return np.bincount(zones, weights=np.nan_to_num(dt), minlength=6)
+
+    def _bannister(self, hrr: np.ndarray, dt: np.ndarray, b: float) -> float:
+        # nansum drops samples without HR or elapsed time, as Series.sum did.
+        return float(np.nansum(dt / 60.0 * hrr * np.exp(b * hrr)))
+
+    def _edwards(self, zone_seconds: np.ndarray, coefficient) -> float:
+        return float(np.dot(coefficient, zone_seconds[1:6] / 60.0))
 
     def assign_zones_hrr(self, h_r: pd.Series, config: AthleteConfig) -> pd.Series:
-        x = self.hrr_intensity(h_r, config).clip(lower=0, upper=1.2)
-        bounds = np.array(config.h_r_r_bound)
-        z = np.digitize(x, bounds, right=True).clip(1, 5)
+        z = self._zone_indices(self._clipped_hrr(h_r.to_numpy(dtype=float), config), config)
         return pd.Series(z, index=h_r.index)
 
     def time_in_zones(self, df: pd.DataFrame, config: AthleteConfig) -> dict:
-        z = self.assign_zones_hrr(df["h_r"], config)
-        return {f"z{k}_sec": float(df.loc[z == k, "dt_s"].sum()) for k in range(1, 6)}
+        z = self._zone_indices(self._clipped_hrr(df["h_r"].to_numpy(dtype=float), config), config)
+        seconds = self._zone_seconds(z, df["dt_s"].to_numpy(dtype=float))
+        return {f"z{k}_sec": float(seconds[k]) for k in range(1, 6)}
 
     def bannister_trimp(self, df: pd.DataFrame, cfg: AthleteConfig) -> float:
-        dt_min = (df["dt_s"] / 60.0).fillna(0)
-        hrr = self.hrr_intensity(df["h_r"].astype(float), cfg).clip(lower=0, upper=1.2)
-        return float((dt_min * hrr * np.exp(cfg.b * hrr)).sum())
+        hrr = self._clipped_hrr(df["h_r"].to_numpy(dtype=float), cfg)
+        return self._bannister(hrr, df["dt_s"].to_numpy(dtype=float), cfg.b)
 
     def edwards_trimp(self, df: pd.DataFrame, cfg: AthleteConfig) -> float:
-        z = self.assign_zones_hrr(df["h_r"], cfg)
-        total = 0.0
-        for k, coeff in enumerate(cfg.coefficient, start=1):
-            minutes = df.loc[z == k, "dt_s"].sum() / 60.0
-            total += coeff * minutes
-        return float(total)
+        z = self._zone_indices(self._clipped_hrr(df["h_r"].to_numpy(dtype=float), cfg), cfg)
+        return self._edwards(self._zone_seconds(z, df["dt_s"].to_numpy(dtype=float)), cfg._coef_arr)
 
     def summarize_exercise(self, df_ex: pd.DataFrame, config: AthleteConfig, source_file=None) -> dict:
         start = df_ex["time"].iloc[0]
-        duration_s = float(df_ex["dt_s"].sum())
+        # Reduce on raw float arrays to skip the per-call pandas Series machinery.
+        dt_s = df_ex["dt_s"].to_numpy(dtype=float)
+        dist = df_ex["dist_m"].to_numpy(dtype=float)
+        duration_s = float(np.nansum(dt_s))
 
-        if df_ex["dist_m"].notna().any():
-            dist_m = float(df_ex["dist_m"].iloc[-1] - df_ex["dist_m"].iloc[0])
+        if not np.isnan(dist).all():
+            dist_m = float(dist[-1] - dist[0])
             dist_km = dist_m / 1000.0
         else:
             dist_km = np.nan
 
-        zones = self.time_in_zones(df_ex, config)
+        # Intensity, zones and zone seconds are computed once and shared by both TRIMP scores.
+        hrr = self._clipped_hrr(df_ex["h_r"].to_numpy(dtype=float), config)
+        seconds = self._zone_seconds(self._zone_indices(hrr, config), dt_s)
 
         return {
             "date": start.tz_convert(None).date(),
@@ -168,35 +355,103 @@ class DataCleaner:
             "source_file": source_file,
             "duration_s": duration_s,
             "distance_km": dist_km,
-            "avg_h_r": float(df_ex["h_r"].mean(skipna=True)),
-            "avg_speed_mps": float(df_ex["speed_mps"].mean(skipna=True)),
-            "trimp_bannister": self.bannister_trimp(df_ex, config),
-            "trimp_edwards": self.edwards_trimp(df_ex, config),
-            **zones,
+            "avg_h_r": _nanmean(df_ex["h_r"].to_numpy(dtype=float)),
+            "avg_speed_mps": _nanmean(df_ex["speed_mps"].to_numpy(dtype=float)),
+            "trimp_bannister": self._bannister(hrr, dt_s, config.b),
+            "trimp_edwards": self._edwards(seconds, config._coef_arr),
+            **{f"z{k}_sec": float(seconds[k]) for k in range(1, 6)},
         }
 
-    def exercise_summaries(self, exercises, config=None) -> pd.DataFrame:
-        summaries = []
+    def _summarize_exercises(self, frames, source_files, cfg: AthleteConfig) -> pd.DataFrame:
+        """
+        Summarize many exercise timeframes at once, grouping the concatenated trackpoints by exercise.
+        """
+        lengths = np.fromiter((len(df) for df in frames), dtype=np.intp, count=len(frames))
+        ends = np.cumsum(lengths)
+        starts = ends - lengths
+        n_ex = len(frames)
+        ex_id = np.repeat(np.arange(n_ex), lengths)
+
+        def column(name):
+            return np.concatenate([df[name].to_numpy(dtype=float) for df in frames])
+
+        def group_nanmean(values):
+            valid = ~np.isnan(values)
+            sums = np.bincount(ex_id[valid], weights=values[valid], minlength=n_ex)
+            counts = np.bincount(ex_id[valid], minlength=n_ex)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return np.where(counts > 0, sums / counts, np.nan)
+
+        dt_s = column("dt_s")
+        dt = np.nan_to_num(dt_s)
+        h_r = column("h_r")
+        dist = column("dist_m")
+
+        hrr = self._clipped_hrr(h_r, cfg)
+        zones = self._zone_indices(hrr, cfg)
+        zone_sec = np.bincount(ex_id * 6 + zones, weights=dt, minlength=n_ex * 6).reshape(n_ex, 6)
+
+        bannister = dt_s / 60.0 * hrr * np.exp(cfg.b * hrr)
+        bannister[np.isnan(bannister)] = 0.0
+
+        start = pd.DatetimeIndex([df["time"].iloc[0] for df in frames])
+
+        summary = {
+            "date": start.tz_convert(None).date,
+            "start_time": start,
+            "source_file": source_files,
+            "duration_s": np.bincount(ex_id, weights=dt, minlength=n_ex),
+            "distance_km": (dist[ends - 1] - dist[starts]) / 1000.0,
+            "avg_h_r": group_nanmean(h_r),
+            "avg_speed_mps": group_nanmean(column("speed_mps")),
+            "trimp_bannister": np.bincount(ex_id, weights=bannister, minlength=n_ex),
+            "trimp_edwards": zone_sec[:, 1:6] / 60.0 @ cfg._coef_arr,
+        }
+        for k in range(1, 6):
+            summary[f"z{k}_sec"] = zone_sec[:, k]
+        return pd.DataFrame(summary)
+
+    def exercise_summaries(self, exercises, config=None, workers=1) -> pd.DataFrame:
+        """
+        Summarize every Biking exercise into one row per exercise, sorted by start time.
+        With workers > 1 the per-exercise frames are built in a process pool; results keep the input order.
+        """
         cfg = config or AthleteConfig()
-        for (source_ref, exercise) in exercises:
-            if exercise.activity_type == "Biking":
-                df_exer = self.exercise_timeframes(exercise)
+        biking = [(source_ref, exercise) for (source_ref, exercise) in exercises if exercise.activity_type == "Biking"]
+        with ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as pool:
+            if pool is None:
+                timeframes = map(self.exercise_timeframes, (exercise for _, exercise in biking))
+            else:
+                timeframes = pool.map(
+                    _exercise_timeframes,
+                    [exercise for _, exercise in biking],
+                    chunksize=max(1, len(biking) // (4 * workers)),
+                )
+            frames = []
+            source_files = []
+            for (source_ref, _), df_exer in zip(biking, timeframes):
                 if df_exer is not None:
-                    source_file = source_ref if isinstance(source_ref, str) else None
-                    dict_exer = self.summarize_exercise(df_exer, cfg, source_file=source_file)
-                    if dict_exer:
-                        summaries.append(dict_exer)
-        return pd.DataFrame(summaries).sort_values("start_time")
+                    frames.append(df_exer)
+                    source_files.append(source_ref if isinstance(source_ref, str) else None)
 
-    def hr_zones_summary(self, total_summary: pd.DataFrame, period: str) -> pd.DataFrame:
-        df = total_summary.copy()
-        df["date"] = pd.to_datetime(df["date"])
-        max_date = df["date"].max()
+        if not frames:
+            return pd.DataFrame()
 
-        start = max_date - pd.to_timedelta(period)
+        df = self._summarize_exercises(frames, source_files, cfg)
+        return df.sort_values("start_time")
+
+    def hr_zones_summary(self, total_summary: pd.DataFrame, period: str) -> pd.DataFrame:
+        # build_dashboard already parsed the dates; read the column instead of copying the frame.
+        dates = total_summary["date"]
+        start = dates.max() - pd.to_timedelta(period)
 
         zone_cols = [f"z{i}_sec" for i in range(1, 6)]
-        sums = df.loc[df["date"] >= start, zone_cols].sum()
+        if dates.is_monotonic_increasing:
+            # Summaries come sorted by start time, so the period is a trailing block of rows.
+            lo = np.searchsorted(dates.to_numpy(), start.to_datetime64(), side="left")
+            sums = pd.Series(np.nansum(total_summary[zone_cols].to_numpy(dtype=float)[lo:], axis=0), index=zone_cols)
+        else:
+            sums = total_summary.loc[dates >= start, zone_cols].sum()
 
         out = sums.rename_axis("category").reset_index(name="value")
 
@@ -207,68 +462,79 @@ class DataCleaner:
         Exponentially weighted moving average helper.
         """
         alpha = 2 / (tau_days + 1)
-        return daily.ewm(alpha=alpha, adjust=False).mean()
-
-    def build_dashboard(self, exercises):
+        # Imported here: scipy.signal adds most of a second to importing this module.
+        from scipy.signal import lfilter
+
+        values = daily.to_numpy(dtype=float)
+        if len(values) == 0 or np.isnan(values).any():
+            # pandas skips missing days in its own way; keep it for gappy input.
+            return daily.ewm(alpha=alpha, adjust=False).mean()
+        # The adjust=False recursion y[t] = (1 - alpha) * y[t-1] + alpha * x[t] as one IIR filter call;
+        # the initial state makes y[0] = x[0], as pandas does.
+        smoothed, _ = lfilter([alpha], [1.0, -(1.0 - alpha)], values, zi=[(1.0 - alpha) * values[0]])
+        return pd.Series(smoothed, index=daily.index, name=daily.name)
+
+    def build_dashboard(self, exercises, workers=1):
         """
         Build the dashboard summary dataframe from tcxreader exercises.
         """
-        total_summary = self.exercise_summaries(exercises)
+        total_summary = self.exercise_summaries(exercises, workers=workers)
 
         if total_summary.empty:
             raise ValueError("No usable trackpoints found in given TCX files.")
 
-        total_summary.dropna()
-
-        total_summary["week"] = pd.to_datetime(total_summary["date"]).dt.to_period("W").astype(str)
-        total_summary["date"] = pd.to_datetime(total_summary["date"])
-        total_summary["speed_kmh"] = total_summary["avg_speed_mps"] * 3.6
-        total_summary["duration_min"] = total_summary["duration_s"] / 60
-        total_summary["month"] = total_summary["date"].dt.to_period("M").astype(str)
-        total_summary["week"] = total_summary["date"].dt.to_period("W").astype(str)
-
-        daily_load = total_summary.groupby("date")["trimp_bannister"].sum()
-        daily_load.index = pd.to_datetime(daily_load.index)
-        daily_load = daily_load.asfreq("D", fill_value=0)
-
-        _ = self.ewma_series(daily_load, 42)
-        _ = self.ewma_series(daily_load, 7)
+        # Parse the dates once and derive both period labels from the same series.
+        dates = pd.to_datetime(total_summary["date"])
+        total_summary["date"] = dates
+        total_summary["week"] = dates.dt.to_period("W").astype(str)
+        total_summary["speed_kmh"] = total_summary["avg_speed_mps"].to_numpy(dtype=float) * 3.6
+        total_summary["duration_min"] = total_summary["duration_s"].to_numpy(dtype=float) / 60
+        total_summary["month"] = dates.dt.to_period("M").astype(str)
 
         return total_summary
 
-    def return_figures(self, total_summary: pd.DataFrame, period, window_days=90):
+    def zone_mix_figure(self, total_summary: pd.DataFrame, period):
         """
-        Build plotly figures for the dashboard.
+        Build the HR zone mix pie for the selected period.
         """
+        import plotly.express as plotlyy
+
         weekly_z_hours = self.hr_zones_summary(total_summary, period)
-        figuero1 = plotlyy.pie(
+        return plotlyy.pie(
             weekly_z_hours,
             names="category",
             values="value",
         )
 
-        fig2_df = total_summary.copy()
-        fig2_df = fig2_df.dropna(subset=["avg_h_r"])
-        fig2_df = fig2_df[fig2_df["speed_kmh"] > 0]
+    def efficiency_figure(self, total_summary: pd.DataFrame, window_days=90, max_points=None):
+        """
+        Build the efficiency scatter with its rolling linear trend.
+        When `max_points` is set, both traces are downsampled with LTTB to bound the payload.
+        """
+        import plotly.express as plotlyy
+
+        # Filter once and materialise only the columns the figure reads; dates come parsed from build_dashboard.
+        columns = ["date", "avg_h_r", "speed_kmh"]
+        if "activity_id" in total_summary.columns:
+            columns.append("activity_id")
+        keep_rows = total_summary["avg_h_r"].notna() & (total_summary["speed_kmh"] > 0)
+        fig2_df = total_summary.loc[keep_rows, columns]
         fig2_df["speed_kmh_per_avg_h_r"] = fig2_df["speed_kmh"].fillna(0).div(fig2_df["avg_h_r"])
         fig2_df = fig2_df.sort_values("date")
-        fig2_df["date"] = pd.to_datetime(fig2_df["date"])
-
-        min_points = 2
-        x_seconds = fig2_df["date"].astype("int64") / 1e9
 
-        rolling = []
+        dates = fig2_df["date"].to_numpy()
+        x_seconds = dates.view("i8") / 1e9
+        rolling = _rolling_linear_trend(
+            dates,
+            x_seconds,
+            fig2_df["speed_kmh_per_avg_h_r"].to_numpy(dtype=float),
+            window_days,
+        )
 
-        for i, current_date in enumerate(fig2_df["date"]):
-            start_date = current_date - pd.Timedelta(days=window_days)
-            truth_condition = (fig2_df["date"] >= start_date) & (fig2_df["date"] <= current_date)
-            xs = x_seconds[truth_condition]
-            ys = fig2_df.loc[truth_condition, "speed_kmh_per_avg_h_r"]
-            if len(xs) >= min_points:
-                slope, intercept = np.polyfit(xs, ys, 1)
-                rolling.append(slope * x_seconds.iloc[i] + intercept)
-            else:
-                rolling.append(np.nan)
+        if max_points is not None and len(fig2_df) > max_points:
+            keep = _lttb_indices(x_seconds, fig2_df["speed_kmh_per_avg_h_r"].to_numpy(), max_points)
+            fig2_df = fig2_df.iloc[keep]
+            rolling = rolling[keep]
 
         fig2_kwargs = {}
         line_custom_data = None
@@ -290,8 +556,15 @@ class DataCleaner:
             name=f"{window_days}D rolling trend",
             customdata=line_custom_data,
         )
+        return figuero2
 
-        figuero3 = plotlyy.scatter(
+    def hr_speed_figure(self, total_summary: pd.DataFrame):
+        """
+        Build the average HR vs speed scatter with per-month OLS trendlines.
+        """
+        import plotly.express as plotlyy
+
+        return plotlyy.scatter(
             total_summary,
             x="avg_h_r",
             y="speed_kmh",
@@ -299,21 +572,45 @@ class DataCleaner:
             trendline="ols",
         )
 
+    def heatmap_figure(self, total_summary: pd.DataFrame):
+        """
+        Build the mean HR heatmap over speed and duration bins.
+        """
+        import plotly.express as plotlyy
+
         speed_bins = np.arange(0, total_summary["speed_kmh"].max() + 3, 3)
         dur_bins = np.arange(0, total_summary["duration_min"].max() + 15, 15)
-        total_summary["speed_bin"] = pd.cut(total_summary["speed_kmh"], bins=speed_bins)
-        total_summary["dur_bin"] = pd.cut(total_summary["duration_min"], bins=dur_bins)
-
-        hm = (
-            total_summary.groupby(["dur_bin", "speed_bin"], observed=True)["avg_h_r"]
-            .mean()
-            .reset_index()
+        # Integer bin indices with pd.cut's right-closed (left, right] bins; out-of-range and NaN values drop out.
+        speed_idx = np.searchsorted(speed_bins, total_summary["speed_kmh"].to_numpy(), side="left") - 1
+        dur_idx = np.searchsorted(dur_bins, total_summary["duration_min"].to_numpy(), side="left") - 1
+        keep = (
+            (speed_idx >= 0) & (speed_idx < len(speed_bins) - 1)
+            & (dur_idx >= 0) & (dur_idx < len(dur_bins) - 1)
         )
 
-        hm["speed_mid"] = hm["speed_bin"].apply(lambda x: x.mid)
-        hm["dur_mid"] = hm["dur_bin"].apply(lambda x: x.mid)
+        # One flat cell id per (duration, speed) bin: bincount aggregates without a groupby sort or
+        # MultiIndex, and the present cells come out in the same ascending order groupby produced.
+        n_speed = len(speed_bins) - 1
+        cell = dur_idx[keep] * n_speed + speed_idx[keep]
+        h_r = total_summary["avg_h_r"].to_numpy()[keep]
+        n_cells = (len(dur_bins) - 1) * n_speed
+        has_h_r = ~np.isnan(h_r)
+        sums = np.bincount(cell[has_h_r], weights=h_r[has_h_r], minlength=n_cells)
+        counts = np.bincount(cell[has_h_r], minlength=n_cells)
+        present = np.flatnonzero(np.bincount(cell, minlength=n_cells))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = (sums[present] / counts[present]).astype(h_r.dtype)
+
+        # Bin midpoints computed once per edge array, as Interval.mid would.
+        hm = pd.DataFrame(
+            {
+                "avg_h_r": means,
+                "speed_mid": (speed_bins[:-1] + 0.5 * np.diff(speed_bins))[present % n_speed],
+                "dur_mid": (dur_bins[:-1] + 0.5 * np.diff(dur_bins))[present // n_speed],
+            }
+        )
 
-        figuero4 = plotlyy.density_heatmap(
+        return plotlyy.density_heatmap(
             hm,
             x="speed_mid",
             y="dur_mid",
@@ -325,4 +622,18 @@ class DataCleaner:
             title="Heatmap: mean HR by speed x duration",
         )
 
-        return figuero1, figuero2, figuero3, figuero4
+    def return_figures(self, total_summary: pd.DataFrame, period, window_days=90):
+        """
+        Build plotly figures for the dashboard.
+        """
+        return (
+            self.zone_mix_figure(total_summary, period),
+            self.efficiency_figure(total_summary, window_days),
+            self.hr_speed_figure(total_summary),
+            self.heatmap_figure(total_summary),
+        )
+
+
+def _exercise_timeframes(exercise):
+    # Module-level so process pools pickle only the exercise, not a DataCleaner and its parser.
+    return DataCleaner().exercise_timeframes(exercise)
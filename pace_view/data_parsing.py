@@ -3,33 +3,200 @@ Parsing utilities for TCX files and optional weather enrichment.
 """
 
 import os
+import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from itertools import islice
 from tcxreader.tcxreader import TCXReader
 from sport_activities_features.tcx_manipulation import TCXFile
 from sport_activities_features import WeatherIdentification
 
+try:
+    # lxml parses TCX several times faster; the stdlib parser is the fallback.
+    from lxml import etree as ElementTree
+except ImportError:
+    from xml.etree import ElementTree
+
+TCX_NAMESPACE = {"tcx": "http://www.garmin.com/xmlschemas/TrainingCenterDatabase/v2"}
+_TCX = "{%s}" % TCX_NAMESPACE["tcx"]
+# Qualified tag names compared in the read_tcx_columns loop, built once instead of per child element.
+_ACTIVITY_TAG = _TCX + "Activity"
+_TRACKPOINT_TAG = _TCX + "Trackpoint"
+_TIME_TAG = _TCX + "Time"
+_POSITION_TAG = _TCX + "Position"
+_LATITUDE_TAG = _TCX + "LatitudeDegrees"
+_LONGITUDE_TAG = _TCX + "LongitudeDegrees"
+_ALTITUDE_TAG = _TCX + "AltitudeMeters"
+_DISTANCE_TAG = _TCX + "DistanceMeters"
+_HEART_RATE_TAG = _TCX + "HeartRateBpm"
+# lxml can filter iterparse events by tag in C; the stdlib parser reports every element.
+_ITERPARSE_TAGS = {"tag": (_ACTIVITY_TAG, _TRACKPOINT_TAG)} if hasattr(ElementTree, "LXML_VERSION") else {}
+# Names the on-disk TCX parse cache directory. Bump it whenever read_tcx_columns or _read_tcx_file return
+# something different, so entries written by older readers are dropped instead of reused.
+TCX_CACHE_VERSION = 1
+# Cache subdirectories written by other reader versions (and the unversioned layout) that get pruned.
+_STALE_TCX_CACHE = re.compile(r"v\d+|joblib")
+
+
+_MISSING = object()
+
+
+@lru_cache(maxsize=None)
+def value_getter(keys):
+    """
+    Build a reader for the first of `keys` present on a dict-like or object-like item (0.0 when none is).
+    Cached per key tuple, so mapping it over many weather samples skips the per-call key loop setup.
+    """
+    def get_value(item):
+        if isinstance(item, dict):
+            for k in keys:
+                if k in item:
+                    return item[k]
+        else:
+            for k in keys:
+                value = getattr(item, k, _MISSING)
+                if value is not _MISSING:
+                    return value
+        return 0.0
+
+    return get_value
+
+
+@dataclass(slots=True)
+class TCXTrackColumns:
+    """
+    Sport plus raw per-trackpoint text columns: the part of a TCX file the dashboard summaries use.
+    """
+    activity_type: str | None
+    time: list
+    h_r: list
+    dist_m: list
+    alt_m: list
+    lat: list
+    lon: list
+
+
+def read_tcx_columns(filepath):
+    """
+    Read a TCX file straight into TCXTrackColumns, skipping tcxreader's per-trackpoint objects.
+    Like tcxreader, only activity trackpoints are read and the sport is taken from the last activity.
+    The file is streamed and each trackpoint is cleared once read, so the full element tree is never built.
+    """
+    columns = TCXTrackColumns(None, [], [], [], [], [], [])
+    in_activity = False
+    for event, element in ElementTree.iterparse(filepath, events=("start", "end"), **_ITERPARSE_TAGS):
+        tag = element.tag
+        if tag == _ACTIVITY_TAG:
+            in_activity = event == "start"
+            if in_activity:
+                columns.activity_type = element.get("Sport")
+            else:
+                element.clear()
+            continue
+        if tag != _TRACKPOINT_TAG or event != "end":
+            continue
+        if not in_activity:
+            # Course trackpoints are not part of any activity.
+            element.clear()
+            continue
+        # One pass over the children with tag dispatch, as tcxreader does, but keeping the raw text.
+        time = h_r = dist_m = alt_m = lat = lon = None
+        for child in element:
+            tag = child.tag
+            if tag == _TIME_TAG:
+                time = child.text
+            elif tag == _POSITION_TAG:
+                for position in child:
+                    if position.tag == _LATITUDE_TAG:
+                        lat = position.text
+                    elif position.tag == _LONGITUDE_TAG:
+                        lon = position.text
+            elif tag == _ALTITUDE_TAG:
+                alt_m = child.text
+            elif tag == _DISTANCE_TAG:
+                dist_m = child.text
+            elif tag == _HEART_RATE_TAG:
+                for heart_rate in child:
+                    h_r = heart_rate.text
+        columns.time.append(time)
+        columns.h_r.append(h_r)
+        columns.dist_m.append(dist_m)
+        columns.alt_m.append(alt_m)
+        columns.lat.append(lat)
+        columns.lon.append(lon)
+        element.clear()
+    return columns
+
+
+def _read_tcx_file(filepath):
+    """
+    Worker entry point for parallel parse_tcx_directory(); each process uses its own reader.
+    """
+    return TCXReader().read(filepath, null_value_handling=1)
+
+
+def _read_stamped(read, filepath, mtime_ns, size):
+    """
+    Cached entry point: the mtime and size only key the cache, so an edited file is parsed again.
+    """
+    return read(filepath)
+
+
+def _read_tcx(read, filepath, cache=None):
+    """
+    Run `read(filepath)`, through the on-disk parse cache when one is configured.
+    """
+    if cache is None:
+        return read(filepath)
+    stat = os.stat(filepath)
+    return cache(read, os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size)
+
+
+def _tcx_cache_location(cache_dir):
+    """
+    Return the cache directory of the current reader version, deleting those of any other version.
+    """
+    current = f"v{TCX_CACHE_VERSION}"
+    if os.path.isdir(cache_dir):
+        with os.scandir(cache_dir) as entries:
+            stale = [
+                entry.path
+                for entry in entries
+                if entry.name != current and entry.is_dir() and _STALE_TCX_CACHE.fullmatch(entry.name)
+            ]
+        for path in stale:
+            shutil.rmtree(path, ignore_errors=True)
+    return os.path.join(cache_dir, current)
+
 
 class DataParser:
     """
     Loads raw TCX data and fetches weather context (if configured).
+    With `cache_dir` (requires joblib), parsed TCX files are memoized on disk under a `TCX_CACHE_VERSION`
+    subdirectory; the directories of other versions are deleted. Within a version entries are never evicted:
+    every new version of a file adds one, so the directory grows until it is cleared by hand.
     """
-    def __init__(self, weather_api_key=None, time_delta=1):
+    def __init__(self, weather_api_key=None, time_delta=1, cache_dir=None):
         self.api_key = weather_api_key
         self.time_delta = time_delta
         self.tcx_loader = TCXFile()
         self.tcx_reader = TCXReader()
+        # With a cache_dir, parsed TCX files are kept on disk and reused while their mtime and size are unchanged.
+        self.tcx_cache = None
+        if cache_dir:
+            # Imported here so joblib is only needed when the on-disk cache is used.
+            from joblib import Memory
+
+            self.tcx_cache = Memory(_tcx_cache_location(cache_dir), verbose=0).cache(_read_stamped)
 
     def _get_val(self, item, keys):
         """
         Safely read a value from dict-like or object-like items.
         """
-        for k in keys:
-            if isinstance(item, dict):
-                if k in item:
-                    return item[k]
-            else:
-                if hasattr(item, k):
-                    return getattr(item, k)
-        return 0.0
+        return value_getter(tuple(keys))(item)
 
     def parse_file(self, filepath, is_training=False):
         """
@@ -63,17 +230,30 @@ class DataParser:
         """
         Parse a TCX file using tcxreader (for dashboard summaries).
         """
-        return self.tcx_reader.read(filepath, null_value_handling=1)
+        if self.tcx_cache is None:
+            return self.tcx_reader.read(filepath, null_value_handling=1)
+        return _read_tcx(_read_tcx_file, filepath, self.tcx_cache)
 
-    def parse_tcx_directory(self, dir_path, read_limit=600):
+    def parse_tcx_columns(self, filepath):
+        """
+        Parse only the trackpoint columns of a TCX file (a faster input for dashboard summaries).
+        """
+        return _read_tcx(read_tcx_columns, filepath, self.tcx_cache)
+
+    def parse_tcx_directory(self, dir_path, read_limit=600, workers=1):
         """
         Parse a folder of TCX files into a list of (start_time, exercise).
+        With workers > 1 the files are parsed in a process pool; results keep the directory order.
         """
-        exercise_val = []
-        for idx, file in enumerate(os.listdir(dir_path)):
-            if file.endswith(".tcx"):
-                exercise = self.parse_tcx_file(os.path.join(dir_path, file))
-                exercise_val.append((exercise.start_time, exercise))
-            if idx >= read_limit:
-                break
+        # Only the first read_limit + 1 directory entries are considered, TCX or not.
+        with os.scandir(dir_path) as entries:
+            paths = [entry.path for entry in islice(entries, read_limit + 1) if entry.name.endswith(".tcx")]
+        with ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as pool:
+            if pool is None:
+                exercises = map(self.parse_tcx_file, paths)
+            else:
+                # Several files per task (about four tasks per worker) instead of one pickling round trip per file.
+                read = partial(_read_tcx, _read_tcx_file, cache=self.tcx_cache)
+                exercises = pool.map(read, paths, chunksize=max(1, len(paths) // (4 * workers)))
+            exercise_val = [(exercise.start_time, exercise) for exercise in exercises]
         return exercise_val
@@ -1,8 +1,9 @@
 """
-Random-forest based digital twin for physiological response modeling.
+Gradient-boosting based digital twin for physiological response modeling.
 """
 
-from sklearn.ensemble import RandomForestRegressor
+import numpy as np
+from sklearn.ensemble import HistGradientBoostingRegressor
 
 
 class DigitalTwinModel:
@@ -10,7 +11,8 @@ class DigitalTwinModel:
     Fits a digital twin that predicts heart rate from physics and environment.
     """
     def __init__(self):
-        self.model = RandomForestRegressor(n_estimators=100, max_depth=15, n_jobs=-1)
+        # Histogram-binned boosting fits every sample in about the time a forest needed for every 30th one.
+        self.model = HistGradientBoostingRegressor(max_iter=100, max_depth=8, learning_rate=0.1, early_stopping=False)
         self.is_trained = False
         # wind_speed_mps and wind_dir are implicitly included via virtual_power
         self.features = ["virtual_power", "speed_mps", "dist", "temp", "ele", "hum"]
@@ -28,10 +30,9 @@ class DigitalTwinModel:
 
         df_clean = df_history.dropna(subset=self.features + ["hr"])
 
-        df_resampled = df_clean.iloc[::30]  # Downsample to every 30th second
-
-        X = df_resampled[self.features]
-        y = df_resampled["hr"]
+        # Fit on a plain float matrix so predictions can be made from arrays without feature-name checks.
+        X = df_clean[self.features].to_numpy(dtype=np.float64)
+        y = df_clean["hr"].to_numpy(dtype=np.float64)
 
         self.model.fit(X, y)
         self.is_trained = True
@@ -43,8 +44,15 @@ class DigitalTwinModel:
         """
         if not self.is_trained:
             raise Exception("Model not trained.")
-        X = df_new[self.features].fillna(0)
-        return self.model.predict(X)
+        return self.model.predict(self.feature_matrix(df_new))
+
+    def feature_matrix(self, df_new):
+        """
+        Returns the model features as one float64 array, with missing values set to 0.
+        """
+        X = df_new[self.features].to_numpy(dtype=np.float64, copy=True)
+        X[np.isnan(X)] = 0.0
+        return X
 
     def predict_drift(self, df_new):
         """
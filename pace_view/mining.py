@@ -2,12 +2,23 @@
 Pattern mining for high-level behavioral rules from historical rides.
 """
 
-import os
+import numpy as np
 import pandas as pd
 from niaarm import Dataset, get_rules
 from niapy.algorithms.basic import DifferentialEvolution
 
 
+def _bucket(values, edges, labels):
+    """
+    pd.cut(values, bins=edges, labels=labels) via one binary search over the raw array.
+    Bins are right-closed (left, right]; values outside the edges and NaN get no label.
+    """
+    edges = np.asarray(edges, dtype=float)
+    codes = np.searchsorted(edges, values.to_numpy(dtype=float), side="left") - 1
+    codes[(codes < 0) | (codes >= len(labels))] = -1
+    return pd.Series(pd.Categorical.from_codes(codes, labels, ordered=True), index=values.index)
+
+
 class PatternMiner:
     """
     Mines human-readable rules that explain performance patterns.
@@ -22,18 +33,14 @@ class PatternMiner:
         data = pd.DataFrame()
 
         # 1. Discretize wind
-        data["Wind"] = pd.cut(
-            df["headwind_mps"], bins=[-50, -1, 1, 50], labels=["Tailwind", "Neutral", "Headwind"]
-        )
+        data["Wind"] = _bucket(df["headwind_mps"], [-50, -1, 1, 50], ["Tailwind", "Neutral", "Headwind"])
 
         # 2. Discretize terrain
-        data["Terrain"] = pd.cut(df["grad"], bins=[-1, 0.02, 1], labels=["Flat", "Climb"])
+        data["Terrain"] = _bucket(df["grad"], [-1, 0.02, 1], ["Flat", "Climb"])
 
         # 3. Discretize status
         if "drift" in df.columns:
-            data["Status"] = pd.cut(
-                df["drift"], bins=[-100, -5, 5, 100], labels=["High_Performance", "Normal", "Struggling"]
-            )
+            data["Status"] = _bucket(df["drift"], [-100, -5, 5, 100], ["High_Performance", "Normal", "Struggling"])
         else:
             data["Status"] = "Normal"
 
@@ -82,13 +89,10 @@ class PatternMiner:
             print("No valid data for mining.")
             return self._summarize_rules([])
 
-        # 2. Create dataset file for NiaARM
-        temp_file = "temp_mining_data.csv"
-        discrete_df.to_csv(temp_file, index=False)
-
         try:
-            # Load dataset using NiaARM's loader
-            dataset = Dataset(temp_file)
+            # 2. Hand the frame to NiaARM directly instead of a CSV round trip; plain string
+            # labels give the same sorted categories its CSV loader produced.
+            dataset = Dataset(discrete_df.astype(str).reset_index(drop=True))
 
             # 3. Configure algorithm (Differential Evolution)
             algo = DifferentialEvolution(
@@ -120,8 +124,4 @@ class PatternMiner:
 
         except Exception as e:
             print(f"Mining failed: {e}")
-            return self._summarize_rules([])
-
-        finally:
-            if os.path.exists(temp_file):  # Cleanup temp file
-                os.remove(temp_file)
\ No newline at end of file
+            return self._summarize_rules([])
\ No newline at end of file
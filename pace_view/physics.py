@@ -3,7 +3,58 @@ Physics-based feature engineering for cycling activities.
 """
 
 import numpy as np
-import pandas as pd
+
+
+def _shift(values: np.ndarray) -> np.ndarray:
+    """
+    Series.shift(1) on an array: previous value, NaN for the first one.
+    """
+    shifted = np.empty_like(values)
+    shifted[:1] = np.nan
+    shifted[1:] = values[:-1]
+    return shifted
+
+
+def _shift_diff(values: np.ndarray) -> np.ndarray:
+    """
+    Series.diff() on an array: difference to the previous value, NaN for the first one.
+    """
+    diff = np.empty_like(values)
+    diff[:1] = np.nan
+    np.subtract(values[1:], values[:-1], out=diff[1:])
+    return diff
+
+
+def _trailing_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Series.rolling(window, min_periods=1).mean() on an array: mean of the non-NaN values among the
+    last `window` samples, NaN when there are none. Zero padding makes the first windows partial.
+    """
+    if len(values) == 0:
+        return values.copy()
+    # Imported here, like scipy.signal in data_cleaning, so importing this module stays cheap.
+    from scipy.ndimage import uniform_filter1d
+
+    valid = ~np.isnan(values)
+    # A centred filter shifted by origin covers samples [i - window + 1, i].
+    origin = (window - 1) // 2
+    sums = uniform_filter1d(np.where(valid, values, 0.0), window, mode="constant", origin=origin)
+    counts = uniform_filter1d(valid.astype(float), window, mode="constant", origin=origin)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(counts > 0.5 / window, sums / counts, np.nan)
+
+
+def _bfill(values: np.ndarray) -> np.ndarray:
+    """
+    Series.bfill() on an array: each NaN takes the next non-NaN value; trailing NaNs stay.
+    """
+    n = len(values)
+    source = np.where(np.isnan(values), n, np.arange(n))
+    source = np.minimum.accumulate(source[::-1])[::-1]
+    filled = np.full(n, np.nan)
+    found = source < n
+    filled[found] = values[source[found]]
+    return filled
 
 
 class PhysicsEngine:
@@ -20,39 +71,55 @@ class PhysicsEngine:
         """
         Calculates the virtual power required based on physics model.
         """
-        # 1. Use vectorized calculations for headwind and bearing
-        df["prev_lat"] = df["lat"].shift(1)
-        df["prev_lon"] = df["lon"].shift(1)
+        # Every signal is computed on raw float arrays, so no step pays for index alignment, and
+        # each output column is written back to the frame once.
+        lat = df["lat"].to_numpy(dtype=float)
+        lon = df["lon"].to_numpy(dtype=float)
+        ele = df["ele"].to_numpy(dtype=float)
+        dist = df["dist"].to_numpy(dtype=float)
+        speed = df["speed_mps"].to_numpy(dtype=float)
 
-        lat1, lon1, lat2, lon2 = map(np.radians, [df["prev_lat"], df["prev_lon"], df["lat"], df["lon"]])
+        # 1. Bearing between consecutive points and the headwind component along it
+        prev_lat = _shift(lat)
+        prev_lon = _shift(lon)
+        lat1, lon1, lat2, lon2 = map(np.radians, (prev_lat, prev_lon, lat, lon))
         d_lon = lon2 - lon1
         x = np.sin(d_lon) * np.cos(lat2)
         y = np.cos(lat1) * np.sin(lat2) - (np.sin(lat1) * np.cos(lat2) * np.cos(d_lon))
-        bearing = (np.degrees(np.arctan2(x, y)) + 360) % 360
-        df["bearing"] = bearing.bfill()
+        bearing = _bfill((np.degrees(np.arctan2(x, y)) + 360) % 360)
 
-        wind_rad = np.radians(df["wind_dir"] - df["bearing"])
-        df["headwind_mps"] = df["wind_speed_mps"] * np.cos(wind_rad)
+        wind_rad = np.radians(df["wind_dir"].to_numpy(dtype=float) - bearing)
+        headwind = df["wind_speed_mps"].to_numpy(dtype=float) * np.cos(wind_rad)
 
         # 2. Physics model (smooth elevation first for gradient calculation)
-        df["ele_smooth"] = df["ele"].rolling(window=10, min_periods=1).mean()
-
-        df["grad"] = df["ele_smooth"].diff() / df["dist"].diff()
-        df["grad"] = df["grad"].fillna(0).clip(-0.25, 0.25)
+        ele_smooth = _trailing_mean(ele, 10)
 
-        airspeed = df["speed_mps"] + df["headwind_mps"]  # Effective airspeed
-        p_aero = 0.5 * self.rho * self.cd_a * (airspeed**2) * df["speed_mps"]  # Aerodynamic power
+        with np.errstate(divide="ignore", invalid="ignore"):
+            grad = _shift_diff(ele_smooth) / _shift_diff(dist)
+        grad[np.isnan(grad)] = 0.0
+        grad = np.clip(grad, -0.25, 0.25)
 
-        p_grav = self.mass * self.g * np.sin(np.arctan(df["grad"])) * df["speed_mps"]  # Gravitational power
+        airspeed = speed + headwind  # Effective airspeed
+        p_aero = 0.5 * self.rho * self.cd_a * (airspeed**2) * speed  # Aerodynamic power
 
-        p_roll = (
-            self.mass * self.g * 0.005 * np.cos(np.arctan(df["grad"])) * df["speed_mps"]
-        )  # Rolling resistance coefficient
+        slope = np.arctan(grad)
+        p_grav = self.mass * self.g * np.sin(slope) * speed  # Gravitational power
+        p_roll = self.mass * self.g * 0.005 * np.cos(slope) * speed  # Rolling resistance coefficient
 
-        df["p_aero"] = p_aero
-        df["p_grav"] = p_grav
-        df["p_roll"] = p_roll
+        virtual_power = np.clip(p_aero + p_grav + p_roll, 0, None)  # Total virtual power
 
-        df["virtual_power"] = (p_aero + p_grav + p_roll).clip(lower=0)  # Total virtual power
+        for name, values in (
+            ("prev_lat", prev_lat),
+            ("prev_lon", prev_lon),
+            ("bearing", bearing),
+            ("headwind_mps", headwind),
+            ("ele_smooth", ele_smooth),
+            ("grad", grad),
+            ("p_aero", p_aero),
+            ("p_grav", p_grav),
+            ("p_roll", p_roll),
+            ("virtual_power", virtual_power),
+        ):
+            df[name] = values
 
         return df
@@ -2,6 +2,8 @@
 Human-readable explanations built from counterfactual signals.
 """
 
+import numpy as np
+
 
 class RationaleGenerator:
     """
@@ -29,7 +31,8 @@ class RationaleGenerator:
         rationales = {}
 
         # 1. Wind rationale (impact distribution)
-        minutes_in_headwind = len(df[df["headwind_mps"] > self.headwind_threshold_mps]) / 60
+        # Count matching samples on the column alone instead of filtering a copy of the whole frame.
+        minutes_in_headwind = np.count_nonzero(df["headwind_mps"].to_numpy() > self.headwind_threshold_mps) / 60
         total_minutes = len(df) / 60
         pct_headwind = (minutes_in_headwind / total_minutes) * 100 if total_minutes > 0 else 0
 
@@ -43,7 +46,7 @@ class RationaleGenerator:
             rationales["Wind"] = "NEUTRAL: Mostly calm winds."
 
         # 2. Gravity rationale (mechanical)
-        minutes_climbing = len(df[df["grad"] > self.climb_grade_threshold]) / 60
+        minutes_climbing = np.count_nonzero(df["grad"].to_numpy() > self.climb_grade_threshold) / 60
         if minutes_climbing > 20:
             rationales["Terrain"] = f"HIGH RESISTANCE: {minutes_climbing:.0f} mins of steep climbing."
         else:
@@ -1,11 +1,13 @@
+import numpy as np
 import pandas as pd
 import pytest
 
-from pace_view.data_parsing import DataParser
-from pace_view.data_cleaning import DataCleaner
-from pace_view.physics import PhysicsEngine
+from pace_view.data_parsing import DataParser, read_tcx_columns
+from pace_view.data_cleaning import AthleteConfig, DataCleaner, _lttb_indices, _rolling_linear_trend
+from pace_view.physics import PhysicsEngine, _bfill, _trailing_mean
 from pace_view.core import ContextTrainer
 
+import glob
 import os
 
 # DO NOT CHANGE TEST DATASET - SOME ASSERTS IN TESTS RELY ON THAT
@@ -93,3 +95,107 @@ def test_mining_with_fifty_tcx_files(monkeypatch):
     assert "Rationales" in activity_report
     assert "Atmosphere" in activity_report["Rationales"]
     assert "COOLING EFFECT" in activity_report["Rationales"]["Atmosphere"]
+
+
+#ewma helper must match pandas' adjust=False ewm, with and without missing days
+def test_ewma_series_matches_pandas_ewm():
+    cleaner = DataCleaner(DataParser(weather_api_key=None))
+    index = pd.date_range("2024-01-01", periods=60, freq="D")
+    daily = pd.Series(np.random.default_rng(0).uniform(0, 120, len(index)), index=index, name="load")
+    gappy = daily.copy()
+    gappy.iloc[[0, 5, 6, 30]] = np.nan
+
+    for series in (daily, gappy, daily.iloc[:0]):
+        for tau_days in (7, 42):
+            expected = series.ewm(alpha=2 / (tau_days + 1), adjust=False).mean()
+            pd.testing.assert_series_equal(cleaner.ewma_series(series, tau_days), expected)
+
+
+#streamed trackpoint columns must give the same timeframes as tcxreader on every test file
+def test_read_tcx_columns_matches_tcxreader():
+    parser = DataParser(weather_api_key=None)
+    cleaner = DataCleaner(parser)
+
+    for tcx_path in sorted(glob.glob("tests/data/*.tcx")):
+        exercise = parser.parse_tcx_file(tcx_path)
+        columns = read_tcx_columns(tcx_path)
+
+        assert columns.activity_type == exercise.activity_type
+        expected = cleaner.exercise_timeframes(exercise)
+        actual = cleaner.exercise_timeframes(columns)
+        if expected is None:
+            assert actual is None
+        else:
+            pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+#batched summaries must match summarizing every exercise on its own
+def test_summarize_exercises_matches_summarize_exercise():
+    parser = DataParser(weather_api_key=None)
+    cleaner = DataCleaner(parser)
+    cfg = AthleteConfig()
+
+    tcx_paths = sorted(glob.glob("tests/data/*.tcx"))
+    frames = [cleaner.exercise_timeframes(parser.parse_tcx_file(tcx_path)) for tcx_path in tcx_paths]
+    tcx_paths = [tcx_path for tcx_path, df in zip(tcx_paths, frames) if df is not None]
+    frames = [df for df in frames if df is not None]
+
+    expected = pd.DataFrame(
+        [cleaner.summarize_exercise(df, cfg, source_file=tcx_path) for tcx_path, df in zip(tcx_paths, frames)]
+    )
+    actual = cleaner._summarize_exercises(frames, tcx_paths, cfg)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+#prefix-sum rolling trend must match a polyfit over every trailing window
+def test_rolling_linear_trend_matches_polyfit():
+    rng = np.random.default_rng(1)
+    dates = np.sort(np.datetime64("2023-01-01") + rng.choice(720, size=150, replace=False).astype("timedelta64[D]"))
+    x = dates.astype("datetime64[s]").astype("int64").astype(float)
+    y = rng.normal(1.0, 0.2, len(dates))
+    window = np.timedelta64(90, "D")
+
+    expected = np.full(len(dates), np.nan)
+    for i, current_date in enumerate(dates):
+        in_window = (dates >= current_date - window) & (dates <= current_date)
+        if in_window.sum() >= 2:
+            slope, intercept = np.polyfit(x[in_window], y[in_window], 1)
+            expected[i] = slope * x[i] + intercept
+
+    np.testing.assert_allclose(_rolling_linear_trend(dates, x, y, 90), expected, rtol=1e-6)
+
+
+#downsampling keeps the end points and returns n_out increasing indices
+def test_lttb_indices():
+    x = np.arange(5000, dtype=float)
+    y = np.sin(x / 50.0) + np.random.default_rng(2).normal(0, 0.1, len(x))
+
+    indices = _lttb_indices(x, y, 500)
+    assert len(indices) == 500
+    assert indices[0] == 0
+    assert indices[-1] == len(x) - 1
+    assert np.all(np.diff(indices) > 0)
+    np.testing.assert_array_equal(_lttb_indices(x[:100], y[:100], 500), np.arange(100))
+
+
+#binary-search bucketing must label values exactly like pd.cut
+def test_bucket_matches_pd_cut():
+    pytest.importorskip("niaarm")
+    pytest.importorskip("niapy")
+    from pace_view.mining import _bucket
+
+    values = pd.Series([-60.0, -50.0, -5.0, -1.0, 0.0, 1.0, 3.5, 50.0, 70.0, np.nan], index=range(10, 20))
+    edges = [-50, -1, 1, 50]
+    labels = ["Tailwind", "Neutral", "Headwind"]
+
+    pd.testing.assert_series_equal(_bucket(values, edges, labels), pd.cut(values, bins=edges, labels=labels))
+
+
+#array helpers of the physics engine must match the pandas calls they replace
+def test_physics_array_helpers_match_pandas():
+    values = np.random.default_rng(3).normal(100.0, 5.0, 60)
+    values[[0, 1, 7, 20, 21, 22, 23, 24, 25, 26, 27, 28, 29, 30, 58, 59]] = np.nan
+    series = pd.Series(values)
+
+    np.testing.assert_allclose(_trailing_mean(values, 10), series.rolling(window=10, min_periods=1).mean(), rtol=1e-9)
+    np.testing.assert_array_equal(_bfill(values), series.bfill().to_numpy())